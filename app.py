@@ -1,10 +1,25 @@
+import importlib
+import logging
+import os
+import time
+
 import streamlit as st
-import google.generativeai as genai
-import pandas as pd
-import json
-import re
-from datetime import datetime
-import uuid
+
+from metrics import observe, use_recorder
+from views.common import get_recorder, get_response_cache, get_storage, render_performance
+
+rerun_start = time.perf_counter()
+
+# Page modules, imported only when selected
+PAGES = {
+    "Create Resume & Cover Letter": "views.create",
+    "Profile Manager": "views.profiles",
+    "History": "views.history",
+    "ATS Optimizer": "views.ats_optimizer",
+}
+
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"),
+                    format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
 # Configure the Streamlit page
 st.set_page_config(
@@ -43,11 +58,11 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+response_cache = get_response_cache()
+storage = get_storage()
+use_recorder(get_recorder())
+
 # Initialize session state
-if 'history' not in st.session_state:
-    st.session_state.history = []
-if 'saved_profiles' not in st.session_state:
-    st.session_state.saved_profiles = {}
 if 'current_id' not in st.session_state:
     st.session_state.current_id = None
 
@@ -55,463 +70,31 @@ if 'current_id' not in st.session_state:
 with st.sidebar:
     st.markdown("### 🔑 API Configuration")
     api_key = st.text_input("Enter Google Gemini API Key:", type="password")
+    bypass_cache = st.checkbox("♻️ Bypass cache (force regeneration)", value=False)
+    cache_stats = response_cache.stats()
+    st.caption(f"Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+    show_performance = st.toggle("📈 Performance panel", key="show_performance")
     
     st.markdown("---")
     st.markdown("### 📋 Navigation")
-    nav_options = ["Create Resume & Cover Letter", "Profile Manager", "History", "ATS Optimizer"]
-    nav_option = st.selectbox("", options=nav_options, index=0)
+    nav_option = st.selectbox("", options=list(PAGES), index=0)
     
     st.markdown("---")
     st.markdown("### 💾 Saved Profiles")
-    if st.session_state.saved_profiles:
-        selected_profile = st.selectbox("Load Profile:", list(st.session_state.saved_profiles.keys()))
+    profile_names = storage.list_profiles()
+    if profile_names:
+        selected_profile = st.selectbox("Load Profile:", profile_names)
         if st.button("Load Selected Profile"):
-            profile_data = st.session_state.saved_profiles[selected_profile]
+            profile_data = storage.get_profile(selected_profile)
             for key, value in profile_data.items():
                 if key in st.session_state:
                     st.session_state[key] = value
             st.success(f"Loaded profile: {selected_profile}")
 
 # Main content area
-if nav_option == "Create Resume & Cover Letter":
-    st.title("📄 AI Resume & Cover Letter Generator")
-    
-    # Create tabs for different sections
-    tab1, tab2, tab3 = st.tabs(["Personal Info", "Job Details", "Generate & Export"])
-    
-    with tab1:
-        st.markdown("## 📝 Personal Information")
-        
-        # Two-column layout for personal info
-        col1, col2 = st.columns(2)
-        with col1:
-            name = st.text_input("👤 Full Name:", key="name")
-            email = st.text_input("✉️ Email:", key="email")
-            phone = st.text_input("📞 Phone:", key="phone")
-            linkedin = st.text_input("🔗 LinkedIn:", key="linkedin")
-        
-        with col2:
-            location = st.text_input("📍 Location:", key="location")
-            headline = st.text_input("💫 Professional Headline:", key="headline")
-            portfolio = st.text_input("🌐 Portfolio (Optional):", key="portfolio")
-            objective = st.text_area("🎯 Career Objective:", key="objective", height=100)
-        
-        st.markdown("## 💼 Professional Experience")
-        experience = st.text_area("Describe your work experience:", key="experience", height=150)
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("## 🛠️ Skills")
-            skills = st.text_area("List your skills:", key="skills", height=100)
-        
-        with col2:
-            st.markdown("## 🎓 Education")
-            education = st.text_area("Education Details:", key="education", height=100)
-            certifications = st.text_area("Certifications (Optional):", key="certifications", height=100)
-            
-        # Save profile option
-        profile_name = st.text_input("Profile Name:", key="profile_name")
-        if st.button("Save Profile") and profile_name:
-            profile_data = {
-                "name": name, "email": email, "phone": phone, "linkedin": linkedin,
-                "portfolio": portfolio, "location": location, "headline": headline,
-                "objective": objective, "experience": experience, "skills": skills,
-                "education": education, "certifications": certifications
-            }
-            st.session_state.saved_profiles[profile_name] = profile_data
-            st.success(f"Profile '{profile_name}' saved!")
-            
-    with tab2:
-        st.markdown("## 🏢 Job Details")
-        
-        job_title = st.text_input("🔍 Job Title:", key="job_title")
-        company = st.text_input("🏢 Company Name:", key="company")
-        
-        st.markdown("### 📋 Job Description")
-        job_description = st.text_area("Paste the job description:", key="job_description", height=250)
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            resume_format = st.selectbox("Resume Format:", 
-                               ["Chronological", "Functional", "Combination", "Targeted"], key="resume_format")
-        
-        with col2:
-            tone = st.selectbox("Cover Letter Tone:", 
-                          options=["Formal", "Professional", "Balanced", "Conversational"], 
-                          index=1, key="tone")
-        
-        st.markdown("### 📚 Additional Information (Optional)")
-        company_research = st.text_area("Company Research:", key="company_research", height=100)
-        
-        uploaded_resume = st.file_uploader("Upload current resume (Optional):", type=['txt', 'pdf', 'docx'])
-        
-    with tab3:
-        st.markdown("## 🚀 Generate Your Documents")
-        
-        generate_options = st.multiselect("Select what to generate:", 
-                                    ["Resume", "Cover Letter", "ATS Analysis"], 
-                                    default=["Resume", "Cover Letter"])
-        
-        if st.button("🚀 Generate Documents"):
-            if not api_key:
-                st.warning("⚠️ Please enter a valid Google Gemini API Key.")
-            elif not name or not experience or not skills or not job_description:
-                st.warning("⚠️ Please fill in all required fields.")
-            else:
-                try:
-                    # Configure API
-                    genai.configure(api_key=api_key)
-                    model = genai.GenerativeModel("gemini-2.0-flash")
-                    
-                    # Create prompts
-                    resume_prompt = (f"Generate a professional {resume_format} resume for {name} with the following details:\n"
-                                    f"Headline: {headline}\nEmail: {email}\nPhone: {phone}\nLocation: {location}\n"
-                                    f"LinkedIn: {linkedin}\nPortfolio: {portfolio}\nObjective: {objective}\n"
-                                    f"Experience: {experience}\nSkills: {skills}\nEducation: {education}\n"
-                                    f"Certifications: {certifications}\n\n"
-                                    f"Optimize for this job description: {job_description}\n"
-                                    f"Format in Markdown with clear sections and bullet points.")
-                    
-                    cover_letter_prompt = (f"Generate a {tone.lower()} tone cover letter for {name} applying for {job_title} at {company}.\n"
-                                         f"Include details about:\nExperience: {experience}\nSkills: {skills}\nEducation: {education}\n"
-                                         f"Tailor to this job description: {job_description}\n"
-                                         f"Additional company context: {company_research}")
-                    
-                    ats_analysis_prompt = (f"Analyze how well this candidate's profile matches the job description:\n"
-                                        f"Candidate Profile:\nName: {name}\nHeadline: {headline}\nExperience: {experience}\n"
-                                        f"Skills: {skills}\nEducation: {education}\nCertifications: {certifications}\n\n"
-                                        f"Job Description: {job_description}\n\n"
-                                        f"Provide: 1) Match percentage, 2) Top 5 keywords missing from profile, "
-                                        f"3) Specific suggestions to improve ATS compatibility, 4) Profile strengths")
-                    
-                    # Generate responses
-                    with st.spinner("🔄 Creating documents..."):
-                        results = {}
-                        
-                        if "Resume" in generate_options:
-                            resume_response = model.generate_content(resume_prompt)
-                            results["resume"] = resume_response.text
-                            
-                        if "Cover Letter" in generate_options:
-                            cover_letter_response = model.generate_content(cover_letter_prompt)
-                            results["cover_letter"] = cover_letter_response.text
-                            
-                        if "ATS Analysis" in generate_options:
-                            ats_response = model.generate_content(ats_analysis_prompt)
-                            results["ats_analysis"] = ats_response.text
-                            
-                        # Save to history
-                        history_entry = {
-                            "id": str(uuid.uuid4()),
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "job_title": job_title,
-                            "company": company,
-                            "results": results
-                        }
-                        st.session_state.history.append(history_entry)
-                        st.session_state.current_id = history_entry["id"]
-                    
-                    # Display results
-                    if "resume" in results:
-                        st.markdown("### ✅ Generated Resume")
-                        st.markdown(results["resume"])
-                        
-                    if "cover_letter" in results:
-                        st.markdown("### ✅ Generated Cover Letter")
-                        st.markdown(results["cover_letter"])
-                        
-                    if "ats_analysis" in results:
-                        st.markdown("### 🔍 ATS Analysis")
-                        
-                        # Extract match percentage using regex
-                        match_text = results["ats_analysis"]
-                        match_percentage = re.search(r'(\d+)%', match_text)
-                        if match_percentage:
-                            match_value = int(match_percentage.group(1))
-                            if match_value >= 80:
-                                st.markdown(f'<div class="feedback-box high-match">Match: {match_value}% - Strong</div>', unsafe_allow_html=True)
-                            elif match_value >= 60:
-                                st.markdown(f'<div class="feedback-box medium-match">Match: {match_value}% - Good</div>', unsafe_allow_html=True)
-                            else:
-                                st.markdown(f'<div class="feedback-box low-match">Match: {match_value}% - Needs Improvement</div>', unsafe_allow_html=True)
-                        
-                        st.markdown(results["ats_analysis"])
-                    
-                    # Export options
-                    st.markdown("### 📥 Export Options")
-                    export_format = st.selectbox("Export Format:", ["Text", "JSON", "Markdown"])
-                    
-                    if st.button("Export Documents"):
-                        if export_format == "Text":
-                            export_text = ""
-                            for doc_type, content in results.items():
-                                export_text += f"--- {doc_type.upper()} ---\n\n{content}\n\n"
-                            st.download_button(
-                                label="Download as Text",
-                                data=export_text,
-                                file_name=f"{name.replace(' ', '_')}_documents.txt",
-                                mime="text/plain"
-                            )
-                        elif export_format == "JSON":
-                            export_json = json.dumps(results, indent=2)
-                            st.download_button(
-                                label="Download as JSON",
-                                data=export_json,
-                                file_name=f"{name.replace(' ', '_')}_documents.json",
-                                mime="application/json"
-                            )
-                        else:  # Markdown
-                            export_md = ""
-                            for doc_type, content in results.items():
-                                export_md += f"# {doc_type.upper()}\n\n{content}\n\n"
-                            st.download_button(
-                                label="Download as Markdown",
-                                data=export_md,
-                                file_name=f"{name.replace(' ', '_')}_documents.md",
-                                mime="text/markdown"
-                            )
-                
-                except Exception as e:
-                    st.error(f"❌ Error: {e}")
-                    st.info("Try using a different model like 'gemini-1.5-pro'.")
-
-elif nav_option == "Profile Manager":
-    st.title("👤 Profile Manager")
-    
-    if not st.session_state.saved_profiles:
-        st.info("No saved profiles yet. Create one in the Resume & Cover Letter tab.")
-    else:
-        profile_to_view = st.selectbox("Select profile to edit:", list(st.session_state.saved_profiles.keys()))
-        
-        if profile_to_view:
-            profile_data = st.session_state.saved_profiles[profile_to_view]
-            st.markdown(f"## Profile: {profile_to_view}")
-            
-            edited_profile = {}
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                edited_profile["name"] = st.text_input("Full Name:", value=profile_data.get("name", ""))
-                edited_profile["email"] = st.text_input("Email:", value=profile_data.get("email", ""))
-                edited_profile["phone"] = st.text_input("Phone:", value=profile_data.get("phone", ""))
-                edited_profile["linkedin"] = st.text_input("LinkedIn:", value=profile_data.get("linkedin", ""))
-                
-            with col2:
-                edited_profile["location"] = st.text_input("Location:", value=profile_data.get("location", ""))
-                edited_profile["headline"] = st.text_input("Headline:", value=profile_data.get("headline", ""))
-                edited_profile["portfolio"] = st.text_input("Portfolio:", value=profile_data.get("portfolio", ""))
-                
-            edited_profile["objective"] = st.text_area("Objective:", value=profile_data.get("objective", ""), height=100)
-            edited_profile["experience"] = st.text_area("Experience:", value=profile_data.get("experience", ""), height=150)
-            edited_profile["skills"] = st.text_area("Skills:", value=profile_data.get("skills", ""), height=100)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                edited_profile["education"] = st.text_area("Education:", value=profile_data.get("education", ""), height=100)
-            with col2:
-                edited_profile["certifications"] = st.text_area("Certifications:", value=profile_data.get("certifications", ""), height=100)
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                if st.button("Update Profile"):
-                    st.session_state.saved_profiles[profile_to_view] = edited_profile
-                    st.success(f"Profile '{profile_to_view}' updated!")
-            with col2:
-                new_name = st.text_input("New Profile Name:")
-                if st.button("Save As New") and new_name:
-                    st.session_state.saved_profiles[new_name] = edited_profile
-                    st.success(f"Profile saved as '{new_name}'!")
-            with col3:
-                if st.button("Delete Profile"):
-                    del st.session_state.saved_profiles[profile_to_view]
-                    st.success(f"Profile '{profile_to_view}' deleted!")
-                    st.rerun()
-
-elif nav_option == "History":
-    st.title("📜 Generation History")
-    
-    if not st.session_state.history:
-        st.info("No generation history available.")
-    else:
-        history_items = st.session_state.history.copy()
-        history_items.reverse()  # Show most recent first
-        
-        for idx, item in enumerate(history_items):
-            with st.expander(f"{item['timestamp']} - {item['job_title']} at {item['company']}"):
-                results = item["results"]
-                
-                if results:
-                    doc_tabs = st.tabs(["Resume", "Cover Letter", "ATS Analysis"])
-                    
-                    with doc_tabs[0]:
-                        if "resume" in results:
-                            st.markdown(results["resume"])
-                        else:
-                            st.info("No resume was generated.")
-                            
-                    with doc_tabs[1]:
-                        if "cover_letter" in results:
-                            st.markdown(results["cover_letter"])
-                        else:
-                            st.info("No cover letter was generated.")
-                            
-                    with doc_tabs[2]:
-                        if "ats_analysis" in results:
-                            st.markdown(results["ats_analysis"])
-                        else:
-                            st.info("No ATS analysis was generated.")
-                
-                if st.button(f"Delete Entry", key=f"del_{idx}"):
-                    st.session_state.history.remove(item)
-                    st.success("History entry deleted!")
-                    st.rerun()
+page = importlib.import_module(PAGES[nav_option])
+page.render(api_key, bypass_cache)
+observe("rerun", (time.perf_counter() - rerun_start) * 1000, page=PAGES[nav_option])
 
-elif nav_option == "ATS Optimizer":  
-    """
-    ATS Optimizer Module for Resume Analysis and Optimization
-    
-    This section allows users to analyze the compatibility of their resumes with 
-    a job description based on ATS (Applicant Tracking System) standards.
-    
-    Features:
-    - Text input for resume and job description.
-    - File upload for resume (TXT/PDF) and job description (CSV).
-    - ATS compatibility analysis using AI.
-    - Match score visualization.
-    - Optimized resume generation with keyword enhancements.
-    """
-
-st.title("🎯 ATS Optimizer")  
-  
-col1, col2 = st.columns(2)  
-  
-with col1:  
-    st.markdown("### 📄 Your Resume")  
-    resume_text = st.text_area("Paste your current resume text:", height=300)  
-    uploaded_resume = st.file_uploader("Or upload your resume (TXT, PDF, DOCX, ODT, JSON):", type=["txt", "pdf", "docx", "odt", "json"])  
-      
-with col2:  
-    st.markdown("### 📋 Job Description")  
-    job_desc = st.text_area("Paste the job description:", height=300)  
-    uploaded_csv = st.file_uploader("Or upload a job description file (CSV, TXT, JSON):", type=["csv", "txt", "json"])  
-  
-if st.button("🔍 Analyze ATS Compatibility") and api_key:  
-    """  
-    Analyzes the resume and job description for ATS compatibility.
-    - Checks for missing input fields.
-    - Extracts text from uploaded files.
-    - Sends the data to an AI model for analysis.
-    - Displays a match score and optimization suggestions.
-    """  
-    
-    if not resume_text and not uploaded_resume:  
-        st.warning("Please provide either a resume text or upload a resume file.")  
-    elif not job_desc and not uploaded_csv:  
-        st.warning("Please provide either a job description or upload a file.")  
-    else:  
-        try:  
-            import PyPDF2  
-            import docx  
-            import json  
-            import pandas as pd  
-            import re  
-            from odf.opendocument import load  
-            from odf.text import P  
-              
-            # Extract text from uploaded resume
-            if uploaded_resume:  
-                if uploaded_resume.type == "application/pdf":  
-                    pdf_reader = PyPDF2.PdfReader(uploaded_resume)  
-                    resume_text = "\n".join([page.extract_text() for page in pdf_reader.pages if page.extract_text()])  
-                elif uploaded_resume.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":  
-                    doc = docx.Document(uploaded_resume)  
-                    resume_text = "\n".join([para.text for para in doc.paragraphs])  
-                elif uploaded_resume.type == "application/vnd.oasis.opendocument.text":  
-                    odt_doc = load(uploaded_resume)  
-                    resume_text = "\n".join([elem.firstChild.data for elem in odt_doc.getElementsByType(P) if elem.firstChild])  
-                elif uploaded_resume.type == "application/json":  
-                    resume_text = json.load(uploaded_resume)  
-                    resume_text = json.dumps(resume_text, indent=4)  
-                else:  
-                    resume_text = uploaded_resume.getvalue().decode("utf-8")  
-              
-            # Extract job description
-            if uploaded_csv:  
-                if uploaded_csv.type == "text/csv":  
-                    df = pd.read_csv(uploaded_csv)  
-                    job_desc = " ".join(df.iloc[:, 0].astype(str).tolist())  
-                elif uploaded_csv.type == "application/json":  
-                    job_desc = json.load(uploaded_csv)  
-                    job_desc = json.dumps(job_desc, indent=4)  
-                else:  
-                    job_desc = uploaded_csv.getvalue().decode("utf-8")  
-              
-            # Configure AI Model
-            genai.configure(api_key=api_key)  
-            model = genai.GenerativeModel("gemini-2.0-flash")  
-              
-            # ATS analysis prompt
-            ats_prompt = (f"Perform a detailed ATS compatibility analysis:\n\n"  
-                        f"RESUME:\n{resume_text}\n\n"  
-                        f"JOB DESCRIPTION:\n{job_desc}\n\n"  
-                        f"Provide:\n"  
-                        f"1. Overall match score (percentage)\n"  
-                        f"2. Keywords analysis (present/missing)\n"  
-                        f"3. Recommendations to improve\n"  
-                        f"4. Current resume strengths\n"  
-                        f"5. Suggested modifications with examples\n")  
-              
-            with st.spinner("Analyzing resume..."):  
-                ats_response = model.generate_content(ats_prompt)  
-                analysis = ats_response.text  
-              
-            # Extract match percentage from the AI response
-            match_percentage = re.search(r'(\d+)%', analysis)  
-            if match_percentage:  
-                match_value = int(match_percentage.group(1))  
-                st.markdown("### Match Score")  
-                st.progress(match_value/100)  
-                  
-                # Display feedback based on match score
-                if match_value >= 80:  
-                    st.markdown(f'<div style="padding: 10px; background-color: #2ecc71; color: white; border-radius: 5px;">Score: {match_value}% - Strong Match</div>', unsafe_allow_html=True)    
-                elif match_value >= 60:  
-                    st.markdown(f'<div style="padding: 10px; background-color: #f1c40f; color: black; border-radius: 5px;">Score: {match_value}% - Good Match</div>', unsafe_allow_html=True)  
-                else:  
-                    st.markdown(f'<div style="padding: 10px; background-color: #e74c3c; color: white; border-radius: 5px;">Score: {match_value}% - Needs Improvement</div>', unsafe_allow_html=True)  
-            # Display ATS Analysis  
-            st.markdown("### 📊 Detailed Analysis")  
-            st.markdown(analysis)  
-              
-            # Generate optimized resume if requested  
-            if st.button("✨ Generate Optimized Resume"):  
-                """  
-                Generates an optimized resume based on ATS recommendations.
-                - Rephrases content to maximize keyword matching.
-                - Retains the same structure while improving ATS readability.
-                - Outputs the resume in Markdown format.
-                """  
-                
-                optimize_prompt = (f"Based on this resume:\n{resume_text}\n\n"  
-                                f"And this job description:\n{job_desc}\n\n"  
-                                f"Generate a fully optimized resume for ATS compatibility. "  
-                                f"Keep the same basic information but rephrase and enhance "  
-                                f"to maximize keyword matching. Format in Markdown.")  
-                  
-                with st.spinner("Generating optimized resume..."):  
-                    optimized_response = model.generate_content(optimize_prompt)  
-                    optimized_resume = optimized_response.text  
-                  
-                st.markdown("### ✅ Optimized Resume")  
-                st.markdown(optimized_resume)  
-                  
-                # Provide a download option  
-                st.download_button(  
-                    label="Download Optimized Resume",  
-                    data=optimized_resume,  
-                    file_name="optimized_resume.md",  
-                    mime="text/markdown"  
-                )  
-          
-        except Exception as e:  
-            st.error(f"❌ Error: {e}")
+if show_performance:
+    render_performance(api_key)
@@ -0,0 +1,269 @@
+"""
+Local, deterministic ATS keyword scoring.
+
+The job description is reduced to weighted keywords: single words plus the
+multi-word skills listed in SKILL_PHRASES. The match score is the weighted
+share of those keywords that also appear in the resume. Known skills weigh
+more than ordinary words, repeated words weigh more than one-off mentions,
+and when many job descriptions are scored together (score_many) their IDF
+lowers the weight of words that every posting shares.
+
+Scoring takes milliseconds and needs no API call, so the LLM is only asked
+for the narrative suggestions.
+"""
+
+import math
+import re
+import time
+from collections import Counter
+
+# Words that carry no signal for keyword matching
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either etc few for from further
+had has have having he her here hers him his how i if in into is it its itself just may me might more
+most must my no nor not now of off on once only or other our ours out over own per same she should so
+some such than that the their theirs them then there these they this those through to too under until
+up upon us very via was we were what when where which while who whom why will with within without would
+you your yours
+able ability across applicant applicants apply benefits candidate candidates company day days description
+desired develop developing environment excellent experience experienced familiarity good great help
+hiring ideal including job join knowledge looking need needed new opportunity plus position preferred qualification
+qualifications related required requirement requirements responsibilities responsible role skill skills
+seeking strong team teams understanding using want work working year years
+""".split())
+
+# Multi-word skills and tools matched as single keywords (normalized below)
+_SKILL_PHRASES = """
+machine learning
+deep learning
+natural language processing
+computer vision
+data science
+data analysis
+data engineering
+data pipelines
+data visualization
+data modeling
+big data
+business intelligence
+project management
+product management
+program management
+stakeholder management
+change management
+risk management
+supply chain
+customer service
+customer success
+account management
+business development
+digital marketing
+content marketing
+social media
+search engine optimization
+financial analysis
+financial modeling
+software development
+software engineering
+web development
+front end
+back end
+full stack
+mobile development
+test automation
+unit testing
+continuous integration
+continuous delivery
+version control
+cloud computing
+google cloud
+amazon web services
+microsoft azure
+site reliability
+incident response
+information security
+network security
+penetration testing
+user experience
+user interface
+agile methodologies
+scrum master
+technical writing
+public speaking
+problem solving
+critical thinking
+team leadership
+cross functional
+object oriented
+rest api
+rest apis
+spring boot
+ruby on rails
+node js
+react native
+power bi
+google analytics
+large language models
+generative ai
+"""
+
+# Single-word skills that get the skill weight
+SKILL_WORDS = frozenset("""
+python java javascript typescript go golang rust c c++ c# scala kotlin swift ruby php r matlab perl bash
+sql nosql postgresql mysql sqlite mongodb redis cassandra elasticsearch kafka spark hadoop airflow dbt
+snowflake bigquery redshift databricks tableau looker excel pandas numpy scipy pytorch tensorflow keras
+sklearn scikit-learn xgboost nlp llm llms aws azure gcp docker kubernetes terraform ansible jenkins
+github gitlab git linux unix graphql grpc rest microservices django flask fastapi spring react angular
+vue next.js node.js express html css sass webpack figma jira confluence salesforce sap hubspot agile
+scrum kanban devops mlops etl ci/cd seo sem crm erp api apis ios android selenium cypress jest pytest
+""".split())
+
+# Skill words that are also everyday English or single letters ("I go", "R&D"). They only
+# count, as skills, where the original text writes them like a name (see used_as_skill)
+AMBIGUOUS_SKILLS = frozenset("go r c express spring rest swift excel react rust ruby".split())
+AMBIGUOUS_RE = re.compile(r"(?<![\w&'+#./-])(%s)(?![\w&'+#-])" % "|".join(
+    sorted({form for word in AMBIGUOUS_SKILLS for form in (word.capitalize(), word.upper())})))
+NEXT_WORD_RE = re.compile(r"\s*([A-Za-z]+)")
+
+SKILL_WEIGHT = 2.0
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def normalize(token):
+    """Fold simple plurals so "developers" matches "developer"."""
+    if len(token) > 4 and token.endswith("s") and not token.endswith("ss") and token not in SKILL_WORDS:
+        return token[:-1]
+    return token
+
+
+SKILL_PHRASES = frozenset(" ".join(normalize(word) for word in phrase.split())
+                          for phrase in _SKILL_PHRASES.strip().splitlines())
+MAX_PHRASE_WORDS = max(len(phrase.split()) for phrase in SKILL_PHRASES)
+
+
+def tokenize(text):
+    return [normalize(token.strip(".-/")) for token in TOKEN_RE.findall(text.lower())]
+
+
+def used_as_skill(text):
+    """
+    The AMBIGUOUS_SKILLS that `text` uses as skills: capitalised ("Go", "REST")
+    and not joined to other characters ("R&D"). At the start of a sentence or
+    line, where any word is capitalised, they also have to open a list
+    ("Go, Python") or be followed by a word that is not a stopword
+    ("Go developer", not "Go to").
+    """
+    found = set()
+    for match in AMBIGUOUS_RE.finditer(text):
+        word = match.group(1).lower()
+        if word in found:
+            continue
+        before = text[max(0, match.start() - 40):match.start()].rstrip(" \t-*•")
+        if before and before[-1] not in ".!?\n" or not before and match.start() > 40:
+            found.add(word)
+            continue
+        following = NEXT_WORD_RE.match(text, match.end())
+        if text[match.end():match.end() + 1] in (",", "/", ";", "|", ")") or \
+                following and following.group(1).lower() not in STOPWORDS:
+            found.add(word)
+    return found
+
+
+def extract_terms(text):
+    """Counter of keywords in `text`: non-stopword tokens plus known multi-word skills."""
+    tokens = tokenize(text)
+    terms = Counter(token for token in tokens if token not in STOPWORDS and len(token) > 1 or token in SKILL_WORDS)
+    ambiguous = AMBIGUOUS_SKILLS & terms.keys()
+    if ambiguous:
+        for word in ambiguous - used_as_skill(text):
+            del terms[word]
+    for size in range(2, MAX_PHRASE_WORDS + 1):
+        for start in range(len(tokens) - size + 1):
+            phrase = " ".join(tokens[start:start + size])
+            if phrase in SKILL_PHRASES:
+                terms[phrase] += 1
+    return terms
+
+
+def is_skill(term):
+    return term in SKILL_WORDS or term in SKILL_PHRASES
+
+
+def term_weights(job_terms, idf=None):
+    """Weight of each job keyword: log-scaled frequency x skill boost x IDF (if given)."""
+    weights = {}
+    for term, count in job_terms.items():
+        weight = 1.0 + math.log(count)
+        if is_skill(term):
+            weight *= SKILL_WEIGHT
+        if idf is not None:
+            weight *= idf.get(term, 1.0)
+        weights[term] = weight
+    return weights
+
+
+def score_terms(resume_terms, job_terms, idf=None, top_missing=10):
+    weights = term_weights(job_terms, idf)
+    total = sum(weights.values())
+    matched = [term for term in weights if term in resume_terms]
+    missing = sorted((term for term in weights if term not in resume_terms),
+                     key=lambda term: (-weights[term], term))
+    score = round(100 * sum(weights[term] for term in matched) / total) if total else 0
+    matched.sort(key=lambda term: (-weights[term], term))
+    return {
+        "score": score,
+        "matched": matched,
+        "missing": missing[:top_missing],
+        "missing_skills": [term for term in missing if is_skill(term)][:top_missing],
+    }
+
+
+def score_resume(resume_text, job_description, top_missing=10):
+    """
+    Score a resume against one job description.
+
+    Returns a dict with "score" (0-100), "matched" and "missing" keywords
+    (highest weight first), "missing_skills" and "ms".
+    """
+    start = time.perf_counter()
+    result = score_terms(extract_terms(resume_text), extract_terms(job_description), top_missing=top_missing)
+    result["ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def inverse_document_frequency(term_counters):
+    """Smoothed IDF of every term across the given keyword Counters."""
+    document_frequency = Counter()
+    for terms in term_counters:
+        document_frequency.update(terms.keys())
+    total = len(term_counters)
+    return {term: math.log((total + 1) / (count + 1)) + 1 for term, count in document_frequency.items()}
+
+
+def score_many(resume_text, job_descriptions, top_missing=10):
+    """
+    Score one resume against many job descriptions in a single pass.
+
+    The resume is tokenized once and IDF is computed over the whole batch.
+    Returns one result dict per job description (see score_resume), in input
+    order; each "ms" is the batch time divided evenly.
+    """
+    start = time.perf_counter()
+    resume_terms = extract_terms(resume_text)
+    job_terms = [extract_terms(description) for description in job_descriptions]
+    idf = inverse_document_frequency(job_terms)
+    results = [score_terms(resume_terms, terms, idf, top_missing) for terms in job_terms]
+    per_job = (time.perf_counter() - start) * 1000 / max(1, len(results))
+    for result in results:
+        result["ms"] = per_job
+    return results
+
+
+def match_label(score):
+    """Feedback band for a score: (css class, label)."""
+    if score >= 80:
+        return "high-match", "Strong"
+    if score >= 60:
+        return "medium-match", "Good"
+    return "low-match", "Needs Improvement"
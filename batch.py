@@ -0,0 +1,257 @@
+"""
+Headless batch generation: tailor documents for one profile to many job postings.
+
+Usage:
+    python -m batch --profile profile.json --jobs postings.jsonl --out results.jsonl
+    python -m batch --profile profile.json --jobs postings/ --out results.jsonl --docs resume cover_letter ats_analysis
+
+Postings are read lazily: a JSONL file holds one posting object per line
+(job_title, company, job_description, company_research and an optional id),
+and a folder holds one posting per file (TXT/MD/PDF/DOCX/ODT text, or a JSON
+object). Each posting goes through the same prompt builders as the Create
+page, and at most `--concurrency` postings are in flight at a time.
+
+Every finished posting is appended to the output as one JSON line. The output
+doubles as the checkpoint: postings whose id already has a line without an
+error are skipped, so an interrupted run resumes where it stopped (the last
+line of an id wins). Calls go through a `GeminiClient`, so requests and
+tokens per minute are capped, and rate-limited (429) and transient server
+errors are retried with jittered exponential backoff.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ats_scorer import score_resume
+from cache import ResponseCache
+from extractors import extract, job_row
+from client import MODEL, REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE, GeminiClient
+from generation import generate_text, share_context
+from metrics import PROCESS, timed
+from prompts import DOC_TYPES, PROFILE_KEYS, build_profile_context, document_instructions, profile_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOCS = ("resume", "cover_letter")
+
+# Files of a postings folder read as one posting each
+JOB_FILE_EXTENSIONS = {".txt", ".md", ".pdf", ".docx", ".odt", ".json"}
+
+
+def load_profile(path):
+    """Read a profile JSON file (the fields saved by the Profile Manager)."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {key: str(data.get(key) or "") for key in PROFILE_KEYS}
+
+
+def make_job(record, default_id=None):
+    """Normalize a posting record to the job fields of the prompt builders, plus an "id"."""
+    row = job_row(record)
+    record = record if isinstance(record, dict) else {}
+    job = {"job_title": row["title"], "company": row["company"], "job_description": row["description"],
+           "company_research": str(record.get("company_research") or "")}
+    job_id = record.get("id") or default_id
+    if not job_id:
+        # Content hash, so a posting keeps its id when the input is reordered
+        payload = "\0".join((job["job_title"], job["company"], job["job_description"]))
+        job_id = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    job["id"] = str(job_id)
+    return job
+
+
+def _read_job_file(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return make_job(json.load(f), default_id=stem)
+
+    with open(path, "rb") as f:
+        upload = io.BytesIO(f.read())
+    upload.name = path
+    text, _ = extract(upload)
+    return make_job({"job_title": stem.replace("_", " "), "job_description": text}, default_id=stem)
+
+
+def read_jobs(path):
+    """Yield the postings of a JSONL file or a folder one at a time, skipping those without a description."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            file_path = os.path.join(path, name)
+            if os.path.splitext(name)[1].lower() not in JOB_FILE_EXTENSIONS or not os.path.isfile(file_path):
+                continue
+            try:
+                job = _read_job_file(file_path)
+            except Exception as e:
+                logger.warning("Skipping %s: %s", file_path, e)
+                continue
+            if job["job_description"].strip():
+                yield job
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                job = make_job(json.loads(line))
+            except ValueError as e:
+                logger.warning("Skipping line %d of %s: %s", number, path, e)
+                continue
+            if job["job_description"].strip():
+                yield job
+
+
+def completed_ids(out_path):
+    """Ids of the postings with a successful line in `out_path` (the checkpoint)."""
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            if record.get("error"):
+                done.discard(record.get("id"))
+            else:
+                done.add(record.get("id"))
+    return done
+
+
+def generate_job(model, profile, job, doc_types=DEFAULT_DOCS, resume_format="Chronological", tone="Professional",
+                 cache=None):
+    """
+    Generate `doc_types` for one posting, one document at a time.
+
+    Returns the output record: "id", "job_title", "company", "results"
+    ({doc_type: markdown}), "ats_score", "seconds" and "error" (None, or the
+    message of the error that failed the posting).
+    """
+    start = time.perf_counter()
+    record = {"id": job["id"], "job_title": job["job_title"], "company": job["company"],
+              "results": {}, "ats_score": None, "seconds": 0.0, "error": None}
+    try:
+        context, _ = build_profile_context(profile, job)
+        ats_score = score_resume(profile_text(profile), job["job_description"])
+        record["ats_score"] = {key: ats_score[key] for key in ("score", "matched", "missing")}
+
+        bound, prompts, _ = share_context(model, context, document_instructions(doc_types, resume_format, tone,
+                                                                                ats_score))
+        for doc_type, prompt in prompts.items():
+            with timed(f"llm.{doc_type}"):
+                record["results"][doc_type] = generate_text(bound, prompt, cache)
+    except Exception as e:
+        logger.warning("Posting %s failed: %s", job["id"], e)
+        record["error"] = str(e) or type(e).__name__
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def run_batch(model, profile, jobs, out_path, concurrency=4, restart=False, **options):
+    """
+    Generate documents for every posting in `jobs` and append one JSON line each to `out_path`.
+
+    `jobs` is consumed only as workers free up, so it can be a lazy reader
+    such as `read_jobs`. With `restart` the output is overwritten instead of
+    resumed. `options` are passed to `generate_job`. Returns stats with
+    "jobs", "skipped", "failed", "documents", "seconds" and "docs_per_minute".
+    """
+    done = set() if restart else completed_ids(out_path)
+    stats = {"jobs": 0, "skipped": 0, "failed": 0, "documents": 0}
+    start = time.perf_counter()
+
+    cut_off = False
+    if not restart and os.path.exists(out_path) and os.path.getsize(out_path):
+        with open(out_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            cut_off = f.read(1) != b"\n"
+
+    with open(out_path, "w" if restart else "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if cut_off:
+            # Start on a fresh line after a write interrupted by the last run
+            out.write("\n")
+
+        def write(finished):
+            for future in finished:
+                record = future.result()
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                stats["jobs"] += 1
+                stats["failed"] += record["error"] is not None
+                stats["documents"] += len(record["results"])
+            elapsed = time.perf_counter() - start
+            logger.info("%d postings, %d documents, %.1f docs/minute",
+                        stats["jobs"], stats["documents"], stats["documents"] * 60 / elapsed)
+
+        pending = set()
+        for job in jobs:
+            if job["id"] in done:
+                stats["skipped"] += 1
+                continue
+            if len(pending) >= concurrency:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write(finished)
+            pending.add(pool.submit(generate_job, model, profile, job, **options))
+        if pending:
+            write(wait(pending, return_when=ALL_COMPLETED)[0])
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["docs_per_minute"] = stats["documents"] * 60 / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def format_stats(stats):
+    return (f"{stats['documents']} documents for {stats['jobs']} postings in {stats['seconds']:.1f}s "
+            f"({stats['docs_per_minute']:.1f} docs/minute) · {stats['skipped']} skipped · {stats['failed']} failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", required=True, help="Profile JSON file")
+    parser.add_argument("--jobs", required=True, help="JSONL file or folder of job postings")
+    parser.add_argument("--out", required=True, help="JSONL output file, also used as the resume checkpoint")
+    parser.add_argument("--docs", nargs="+", choices=DOC_TYPES, default=list(DEFAULT_DOCS), help="Documents to generate")
+    parser.add_argument("--resume-format", default="Chronological", help="Resume format")
+    parser.add_argument("--tone", default="Professional", help="Cover letter tone")
+    parser.add_argument("--concurrency", type=int, default=4, help="Postings generated at the same time")
+    parser.add_argument("--retries", type=int, default=5, help="Retries of a rate-limited or failed request")
+    parser.add_argument("--backoff", type=float, default=1.0, help="First retry delay (s), doubled on each retry")
+    parser.add_argument("--model", default=MODEL, help="Gemini model name")
+    parser.add_argument("--fallback-models", nargs="*", default=[], help="Models tried when the main one keeps failing")
+    parser.add_argument("--rpm", type=int, default=REQUESTS_PER_MINUTE, help="Max requests per minute")
+    parser.add_argument("--tpm", type=int, default=TOKENS_PER_MINUTE, help="Max input tokens per minute")
+    parser.add_argument("--api-key", default=os.environ.get("GOOGLE_API_KEY"), help="Gemini API key ($GOOGLE_API_KEY)")
+    parser.add_argument("--cache", help="SQLite file for the response cache, reused across runs")
+    parser.add_argument("--restart", action="store_true", help="Overwrite the output instead of resuming")
+    parser.add_argument("--metrics", help="Write per-stage timings in OpenMetrics text format to this file")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("an API key is required (--api-key or $GOOGLE_API_KEY)")
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    cache = ResponseCache(path=args.cache) if args.cache else None
+    client = GeminiClient(args.api_key, args.model, args.fallback_models, requests_per_minute=args.rpm,
+                          tokens_per_minute=args.tpm, retries=args.retries, base_delay=args.backoff)
+    stats = run_batch(client, load_profile(args.profile), read_jobs(args.jobs), args.out,
+                      concurrency=args.concurrency, restart=args.restart, doc_types=args.docs,
+                      resume_format=args.resume_format, tone=args.tone, cache=cache)
+    print(format_stats(stats))
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(PROCESS.openmetrics())
+
+
+if __name__ == "__main__":
+    main()
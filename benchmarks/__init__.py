@@ -0,0 +1 @@
+"""Offline benchmarks for the resume generator. Run from the repository root."""
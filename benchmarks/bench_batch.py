@@ -0,0 +1,73 @@
+"""
+Headless batch throughput (docs/minute) by concurrency, with injected rate limits.
+
+Runs `batch.run_batch` through a `GeminiClient` over synthetic postings,
+then runs it again to check that the checkpoint skips every finished
+posting. By default the model is the in-process fake; with --server the
+real SDK talks to the local fake Gemini server instead.
+
+Usage: python -m benchmarks.bench_batch [--jobs N] [--concurrency N ...] [--latency SECONDS] [--error-rate FRACTION] [--server]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+
+import generation
+from batch import read_jobs, run_batch
+from benchmarks.bench_shared_context import make_inputs
+from benchmarks.fake_gemini import FakeModel
+from benchmarks.fake_gemini_server import FakeGeminiServer
+from benchmarks.fixtures import SAMPLE_LINE
+from client import GeminiClient
+
+
+def write_jobs(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for number in range(count):
+            f.write(json.dumps({"job_title": f"Data Engineer {number}", "company": f"Company {number}",
+                                "job_description": f"Posting {number}: we need a {SAMPLE_LINE.lower()}"}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100, help="Postings per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Postings in flight")
+    parser.add_argument("--latency", type=float, default=0.1, help="Fake model latency per request (s)")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of requests failing with 429")
+    parser.add_argument("--backoff", type=float, default=0.05, help="First retry delay (s)")
+    parser.add_argument("--server", action="store_true", help="Use the real SDK against the fake HTTP server")
+    args = parser.parse_args()
+
+    profile, _ = make_inputs(20)
+    server = None
+    if args.server:
+        server = FakeGeminiServer(latency=args.latency, error_rate=args.error_rate).start()
+        generation.API_ENDPOINT = server.endpoint
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs_path = os.path.join(tmp, "jobs.jsonl")
+        write_jobs(jobs_path, args.jobs)
+
+        print(f"{'workers':>8} {'docs':>6} {'seconds':>8} {'docs/min':>9} {'failed':>7} {'resumed':>8}")
+        for concurrency in args.concurrency:
+            out_path = os.path.join(tmp, f"out_{concurrency}.jsonl")
+            factory = generation.get_model
+            if server is None:
+                fake = FakeModel(latency=args.latency, error_rate=args.error_rate)
+                factory = lambda api_key, model_name: fake  # noqa: E731
+            model = GeminiClient("fake-key", requests_per_minute=100_000, retries=8, base_delay=args.backoff,
+                                 model_factory=factory)
+            options = {"concurrency": concurrency}
+            stats = run_batch(model, profile, read_jobs(jobs_path), out_path, restart=True, **options)
+            again = run_batch(model, profile, read_jobs(jobs_path), out_path, **options)
+            print(f"{concurrency:>8} {stats['documents']:>6} {stats['seconds']:>8.2f} {stats['docs_per_minute']:>9.0f} "
+                  f"{stats['failed']:>7} {again['skipped']:>8}")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Score one resume against many job descriptions: pairwise score_resume()
+calls vs a single score_many() pass.
+
+Usage: python -m benchmarks.bench_batch_scoring [--jobs 100 500 2000]
+"""
+
+import argparse
+import time
+
+from ats_scorer import score_many, score_resume
+from benchmarks.bench_scoring import RESUME
+from benchmarks.fixtures import SAMPLE_LINE
+
+SKILLS = ["Python", "Java", "SQL", "AWS", "Docker", "Kubernetes", "Kafka", "React", "Terraform", "Spark"]
+
+
+def make_jobs(count):
+    return [f"Posting {n}: {SKILLS[n % len(SKILLS)]} and {SKILLS[(n * 3) % len(SKILLS)]} engineer. {SAMPLE_LINE} " * 4
+            for n in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[100, 500, 2000], help="Batch sizes to test")
+    args = parser.parse_args()
+
+    print(f"{'jobs':>6} {'pairwise ms':>12} {'batch ms':>9}")
+    for count in args.jobs:
+        jobs = make_jobs(count)
+        start = time.perf_counter()
+        for job in jobs:
+            score_resume(RESUME, job)
+        pairwise = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        score_many(RESUME, jobs)
+        batch = (time.perf_counter() - start) * 1000
+        print(f"{count:>6} {pairwise:>12.0f} {batch:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Measure cold vs cached response latency through the response cache.
+
+Usage: python -m benchmarks.bench_cache [--latency SECONDS] [--disk PATH]
+"""
+
+import argparse
+import time
+
+from benchmarks.fake_gemini import FakeModel
+from cache import ResponseCache
+from generation import generate_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake model latency per call (s)")
+    parser.add_argument("--disk", default=None, help="Optional SQLite path for the disk tier")
+    args = parser.parse_args()
+
+    model = FakeModel(latency=args.latency)
+    cache = ResponseCache(path=args.disk)
+    prompt = "Generate a professional Chronological resume for Jane Doe"
+
+    for label in ("cold", "warm"):
+        start = time.perf_counter()
+        generate_text(model, prompt, cache=cache)
+        print(f"{label:>5}: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    if args.disk:
+        cache.memory.clear()
+        start = time.perf_counter()
+        generate_text(model, prompt, cache=cache)
+        print(f" disk: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    print(f"model calls: {model.calls}, cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Concurrent sessions against one API quota: a client per session vs one shared client.
+
+The fake model accepts `--quota` requests per second and answers the rest
+with 429, like a shared Gemini key (scaled from minutes to seconds so the
+run is short). Each session sends `--calls` requests. With a client per
+session every session believes it owns the whole quota, so the model sees
+bursts of rejected calls; the shared client's token bucket spaces all
+sessions together. A last run shows the circuit breaker failing fast once
+the model only returns errors.
+
+Usage: python -m benchmarks.bench_client [--sessions N] [--calls N] [--quota PER_SECOND] [--latency SECONDS]
+"""
+
+import argparse
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_gemini import FakeAPIError, FakeModel
+from client import CircuitOpenError, GeminiClient, TokenBucket
+
+
+class QuotaModel(FakeModel):
+    """Fake model that rejects calls beyond `quota` per rolling second with 429."""
+
+    def __init__(self, quota, **kwargs):
+        super().__init__(**kwargs)
+        self.quota = quota
+        self.rejected = 0
+        self._window = deque()
+
+    def generate_content(self, contents, stream=False, **kwargs):
+        with self._lock:
+            now = time.monotonic()
+            while self._window and self._window[0] <= now - 1:
+                self._window.popleft()
+            allowed = len(self._window) < self.quota
+            if allowed:
+                self._window.append(now)
+            else:
+                self.rejected += 1
+        if not allowed:
+            raise FakeAPIError()
+        return super().generate_content(contents, stream=stream, **kwargs)
+
+
+def make_client(model, quota):
+    client = GeminiClient("key", retries=3, base_delay=0.2, model_factory=lambda api_key, model_name: model)
+    # Same rate as the fake quota, with a one-second burst instead of one minute
+    client.request_bucket = TokenBucket(quota * 60, capacity=quota)
+    return client
+
+
+def run_sessions(clients, calls):
+    """Each client in `clients` is one session sending `calls` requests; returns (seconds, failed calls)."""
+    failed = []
+
+    def session(client):
+        for number in range(calls):
+            try:
+                client.generate_content(f"prompt {number}")
+            except FakeAPIError:
+                failed.append(number)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+        list(pool.map(session, clients))
+    return time.perf_counter() - start, len(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--calls", type=int, default=10, help="Requests per session")
+    parser.add_argument("--quota", type=int, default=20, help="Requests per second the fake key accepts")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model latency per request (s)")
+    args = parser.parse_args()
+
+    print(f"{'clients':>12} {'seconds':>8} {'failed':>7} {'429s':>6}")
+    for label in ("per-session", "shared"):
+        model = QuotaModel(args.quota, latency=args.latency)
+        if label == "shared":
+            clients = [make_client(model, args.quota)] * args.sessions
+        else:
+            clients = [make_client(model, args.quota) for _ in range(args.sessions)]
+        seconds, failed = run_sessions(clients, args.calls)
+        print(f"{label:>12} {seconds:>8.2f} {failed:>7} {model.rejected:>6}")
+
+    model = FakeModel(latency=args.latency, error_rate=1.0)
+    client = GeminiClient("key", retries=1, base_delay=0.05, breaker_threshold=3, breaker_reset=60,
+                          model_factory=lambda api_key, model_name: model)
+    requests = args.calls * 2
+    fast = 0
+    start = time.perf_counter()
+    for number in range(requests):
+        try:
+            client.generate_content(f"prompt {number}")
+        except CircuitOpenError:
+            fast += 1
+        except FakeAPIError:
+            pass
+    print(f"breaker: {model.calls} model calls for {requests} requests, {fast} failed fast "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Round-trips and wall time: one request per document vs one combined JSON request.
+
+The fake model charges `--latency` per request, so the gap between the two
+modes is the cost of the extra round-trips (and rate-limit slots) alone.
+
+Usage: python -m benchmarks.bench_combined [--latency SECONDS] [--runs N]
+"""
+
+import argparse
+import json
+import time
+
+from ats_scorer import score_resume
+from benchmarks.bench_shared_context import make_inputs
+from benchmarks.fake_gemini import FakeModel
+from generation import generate_combined, generate_documents, share_context
+from prompts import (ats_analysis_instructions, build_profile_context, combined_instructions,
+                     cover_letter_instructions, profile_text, resume_instructions)
+
+REPORT = json.dumps({"resume_markdown": "# Jane Doe", "cover_letter_markdown": "Dear hiring manager,",
+                     "match_score": 72, "missing_keywords": ["terraform"], "strengths": ["python"]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake model latency per request (s)")
+    parser.add_argument("--runs", type=int, default=3, help="Generation batches per mode")
+    args = parser.parse_args()
+
+    profile, job = make_inputs(20)
+    context, _ = build_profile_context(profile, job)
+    ats_score = score_resume(profile_text(profile), job["job_description"])
+    instructions = {
+        "resume": resume_instructions("Chronological"),
+        "cover_letter": cover_letter_instructions("Professional"),
+        "ats_analysis": ats_analysis_instructions(ats_score),
+    }
+
+    # Serial calls show the round-trip count; the concurrent path hides it behind threads
+    model = FakeModel(latency=args.latency, response_text=REPORT)
+    _, prompts, _ = share_context(model, context, instructions)
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        list(generate_documents(model, prompts, max_workers=1))
+    per_document = (time.perf_counter() - start) / args.runs
+    print(f"per-document: {model.calls / args.runs:.0f} requests, {model.input_tokens / args.runs:.0f} input tokens, "
+          f"{per_document:.2f}s per batch (serial)")
+
+    model = FakeModel(latency=args.latency, response_text=REPORT)
+    _, prompts, _ = share_context(model, context, {"combined": combined_instructions("Chronological", "Professional",
+                                                                                     ats_score)})
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        generate_combined(model, prompts["combined"])
+    combined = (time.perf_counter() - start) / args.runs
+    print(f"combined:     {model.calls / args.runs:.0f} requests, {model.input_tokens / args.runs:.0f} input tokens, "
+          f"{combined:.2f}s per batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Export: time to render each format cold vs from the export cache, and a whole-history ZIP.
+
+The ZIP is written into a temporary file one entry at a time; its
+tracemalloc peak shows memory does not grow with the number of entries.
+
+Usage: python -m benchmarks.bench_export [--entries N ...] [--formats txt md pdf ...]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_storage import make_entries
+from cache import LRUCache
+from exporters import FORMATS, export_cached, write_history_zip
+from storage import MemoryStorage
+
+
+def time_ms(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[10, 100, 500], help="History sizes for the ZIP")
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS), help="Formats")
+    args = parser.parse_args()
+
+    entry = make_entries(1)[0]
+    cache = LRUCache()
+    print(f"{'format':>8} {'KB':>8} {'cold ms':>9} {'cached ms':>10}")
+    formats = []
+    for fmt in args.formats:
+        try:
+            cold = time_ms(lambda: export_cached(entry, fmt, cache))
+        except ImportError as e:
+            print(f"{fmt:>8} skipped: missing dependency {e.name}")
+            continue
+        cached = time_ms(lambda: export_cached(entry, fmt, cache))
+        print(f"{fmt:>8} {len(export_cached(entry, fmt, cache)) / 1024:>8.1f} {cold:>9.2f} {cached:>10.4f}")
+        formats.append(fmt)
+
+    print(f"\n{'entries':>8} {'ZIP s':>8} {'ZIP MB':>8} {'peak MB':>8}")
+    for count in args.entries:
+        storage = MemoryStorage(max_history=count)
+        storage.add_history_many(make_entries(count))
+        with tempfile.TemporaryFile() as f:
+            tracemalloc.start()
+            start = time.perf_counter()
+            write_history_zip(storage, f, formats)
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            size = f.seek(0, os.SEEK_END)
+        print(f"{count:>8} {seconds:>8.2f} {size / (1024 * 1024):>8.2f} {peak / (1024 * 1024):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
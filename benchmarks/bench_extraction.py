@@ -0,0 +1,50 @@
+"""
+Extraction time and peak memory: whole-document extraction vs the capped
+streaming pipeline in extractors.py.
+
+Usage: python -m benchmarks.bench_extraction [--pages 10 100 500]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.fixtures import make_upload
+from extractors import MAX_CHARS, MAX_PAGES, extract
+
+
+def extract_whole_pdf(upload):
+    # The original ATS Optimizer approach: every page, extract_text() twice
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(upload)
+    return "\n".join([page.extract_text() for page in reader.pages if page.extract_text()])
+
+
+def measure(func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 500], help="PDF sizes to test")
+    args = parser.parse_args()
+
+    import PyPDF2  # noqa: F401  (keep the import cost out of the timings)
+
+    print(f"caps: {MAX_PAGES} pages, {MAX_CHARS:,} chars")
+    print(f"{'pages':>6} {'whole ms':>10} {'whole MB':>9} {'capped ms':>10} {'capped MB':>10}")
+    for pages in args.pages:
+        whole_ms, whole_mb = measure(extract_whole_pdf, make_upload("pdf", pages))
+        capped_ms, capped_mb = measure(extract, make_upload("pdf", pages))
+        print(f"{pages:>6} {whole_ms:>10.0f} {whole_mb:>9.1f} {capped_ms:>10.0f} {capped_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Compare sequential and concurrent generation of the Create flow documents.
+
+Usage: python -m benchmarks.bench_generation [--latency SECONDS] [--docs N]
+"""
+
+import argparse
+import time
+
+from benchmarks.fake_gemini import FakeModel
+from generation import generate_documents
+
+
+def run_sequential(model, prompts):
+    return {doc_type: model.generate_content(prompt).text for doc_type, prompt in prompts.items()}
+
+
+def run_concurrent(model, prompts):
+    return {doc_type: text for doc_type, text, _ in generate_documents(model, prompts)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake model latency per call (s)")
+    parser.add_argument("--docs", type=int, default=3, help="Number of documents per batch")
+    args = parser.parse_args()
+
+    model = FakeModel(latency=args.latency)
+    prompts = {f"doc_{i}": f"prompt {i}" for i in range(args.docs)}
+
+    timings = {}
+    for label, runner in (("sequential", run_sequential), ("concurrent", run_concurrent)):
+        start = time.perf_counter()
+        runner(model, prompts)
+        timings[label] = time.perf_counter() - start
+        print(f"{label:>10}: {timings[label]:.3f}s")
+
+    print(f"   speedup: {timings['sequential'] / timings['concurrent']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
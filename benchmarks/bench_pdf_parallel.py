@@ -0,0 +1,47 @@
+"""
+Serial vs process-pool extraction of synthetic PDFs, without page or
+character caps.
+
+Usage: python -m benchmarks.bench_pdf_parallel [--pages 10 100 500] [--workers N]
+
+Documents below EXTRACT_PARALLEL_MIN_PAGES fall back to serial extraction,
+so their two columns should match.
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.fixtures import as_upload, make_pdf
+from extractors import PARALLEL_MIN_PAGES, extract, get_pool
+
+
+def timed_extract(data, workers):
+    start = time.perf_counter()
+    text, stats = extract(as_upload(data, "fixture.pdf", "application/pdf"),
+                          max_pages=None, max_chars=None, workers=workers)
+    return (time.perf_counter() - start) * 1000, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 500], help="PDF sizes to test")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size")
+    args = parser.parse_args()
+
+    # Warm up the parser and the pool so start-up costs are not counted
+    timed_extract(make_pdf(1), workers=0)
+    list(get_pool(args.workers).map(abs, range(args.workers)))
+
+    print(f"workers: {args.workers}, parallel threshold: {PARALLEL_MIN_PAGES} pages")
+    print(f"{'pages':>6} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}")
+    for pages in args.pages:
+        data = make_pdf(pages)
+        serial_ms, serial_text = timed_extract(data, workers=0)
+        parallel_ms, parallel_text = timed_extract(data, workers=args.workers)
+        assert serial_text == parallel_text, "parallel extraction changed the page order"
+        print(f"{pages:>6} {serial_ms:>10.0f} {parallel_ms:>12.0f} {serial_ms / parallel_ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Prompt size before and after budgeting, and the time budgeting takes.
+
+Usage: python -m benchmarks.bench_prompt_budget [--budget TOKENS] [--scale N]
+"""
+
+import argparse
+import time
+
+from ats_scorer import score_resume
+from benchmarks.fixtures import SAMPLE_LINE
+from prompts import build_batch_prompt, build_resume_job_context
+
+
+def make_inputs(scale):
+    filler = " ".join(f"Our office {n} has great snacks and a friendly culture." for n in range(scale))
+    job = f"{filler} The role needs Kubernetes, Terraform and Kafka in production. {filler}"
+    resume = "\n".join(f"- {SAMPLE_LINE} Project {n} shipped on Kubernetes." for n in range(scale))
+    return resume, job
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=int, default=6000, help="Token budget per prompt")
+    parser.add_argument("--scale", type=int, nargs="+", default=[50, 500, 2000], help="Input sizes (sentences)")
+    args = parser.parse_args()
+
+    print(f"{'scale':>6} {'prompt':>9} {'tokens before':>14} {'tokens after':>13} {'bytes saved':>12} {'ms':>7}")
+    for scale in args.scale:
+        resume, job = make_inputs(scale)
+        score = score_resume(resume, job)
+        for name, build in (("context", lambda: build_resume_job_context(resume, job, budget=args.budget)),
+                            ("batch", lambda: build_batch_prompt(resume, job, score["score"], ", ".join(score["missing"]),
+                                                                 budget=args.budget))):
+            start = time.perf_counter()
+            _, stats = build()
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{scale:>6} {name:>9} {stats['original_tokens']:>14} {stats['tokens']:>13} "
+                  f"{stats['bytes_saved']:>12} {elapsed:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Measure script rerun time per page with Streamlit's AppTest.
+
+Usage: python -m benchmarks.bench_rerun [--app PATH] [--runs N]
+
+To compare against an older revision, export its script and point --app at
+it, e.g. `git show <rev>:app.py > /tmp/app_before.py` (run from the repo
+root so the module imports resolve).
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+PAGES = ["Create Resume & Cover Letter", "Profile Manager", "History", "ATS Optimizer"]
+
+
+def time_page(app_path, page, runs):
+    at = AppTest.from_file(os.path.abspath(app_path), default_timeout=60).run()
+    at.sidebar.selectbox[0].set_value(page).run()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, len(at.main.children)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default="app.py", help="Streamlit script to benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="Reruns per page")
+    args = parser.parse_args()
+
+    print(f"{'page':<30} {'median ms':>10} {'p95 ms':>8} {'elements':>9}")
+    for page in PAGES:
+        samples, elements = time_page(args.app, page, args.runs)
+        p95 = sorted(samples)[int(0.95 * (len(samples) - 1))]
+        print(f"{page:<30} {statistics.median(samples):>10.1f} {p95:>8.1f} {elements:>9}")
+
+
+if __name__ == "__main__":
+    main()
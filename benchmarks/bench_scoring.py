@@ -0,0 +1,50 @@
+"""
+Local ATS keyword scoring vs asking the LLM for a match percentage.
+
+Usage: python -m benchmarks.bench_scoring [--latency SECONDS] [--runs N]
+
+The LLM path is simulated with the fake model, so its timing is just the
+configured latency; the point is the order-of-magnitude gap and the fact
+that the local score is identical on every run.
+"""
+
+import argparse
+import re
+import statistics
+import time
+
+from ats_scorer import score_resume
+from benchmarks.fake_gemini import FakeModel
+from benchmarks.fixtures import SAMPLE_LINE
+
+RESUME = "\n".join(f"{SAMPLE_LINE} Led project {n} using Kubernetes, Terraform and machine learning." for n in range(40))
+JOB = ("We are hiring a Senior Python Engineer with experience in SQL, AWS, Docker, Kubernetes, Kafka, "
+       "data pipelines, machine learning and CI/CD. Familiarity with Airflow, dbt and Snowflake is a plus. ") * 5
+
+
+def llm_score(model):
+    text = model.generate_content(f"Score this resume:\n{RESUME}\n\nJob:\n{JOB}").text
+    match = re.search(r'(\d+)%', text)
+    return int(match.group(1)) if match else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=2.0, help="Fake model latency per call (s)")
+    parser.add_argument("--runs", type=int, default=50, help="Local scoring repetitions")
+    args = parser.parse_args()
+
+    samples, scores = [], set()
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        scores.add(score_resume(RESUME, JOB)["score"])
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"local: median {statistics.median(samples):.2f} ms over {args.runs} runs, scores seen: {sorted(scores)}")
+
+    start = time.perf_counter()
+    score = llm_score(FakeModel(latency=args.latency))
+    print(f"  llm: {(time.perf_counter() - start) * 1000:.0f} ms for one call (score {score}%, one round-trip per analysis)")
+
+
+if __name__ == "__main__":
+    main()
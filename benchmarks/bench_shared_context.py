@@ -0,0 +1,74 @@
+"""
+Input tokens and batch latency with and without a shared prompt context.
+
+Generates the three Create-page documents with a fake model whose latency
+grows with the input size (`--prefill` seconds per 1,000 input tokens):
+"separate" repeats the context inside every prompt, "prefix" sends it as
+the shared first part of each request, and "cached" uploads it once as
+stand-in cached content.
+
+Usage: python -m benchmarks.bench_shared_context [--latency SECONDS] [--prefill SECONDS] [--scale N ...]
+"""
+
+import argparse
+import time
+
+from ats_scorer import score_resume
+from benchmarks.fake_gemini import FakeModel
+from benchmarks.fixtures import SAMPLE_LINE
+from generation import share_context, stream_documents
+from prompts import (ats_analysis_instructions, build_profile_context, cover_letter_instructions, profile_text,
+                     resume_instructions)
+
+
+def make_inputs(scale):
+    profile = {
+        "name": "Jane Doe", "email": "jane@example.com", "phone": "555-0100", "linkedin": "", "portfolio": "",
+        "location": "Remote", "headline": "Data Engineer", "objective": "Build reliable data platforms.",
+        "experience": "\n".join(f"- {SAMPLE_LINE} Project {n}." for n in range(scale)),
+        "skills": "Python, SQL, Docker, AWS, Kafka", "education": "BSc Computer Science", "certifications": "",
+    }
+    job = {"job_title": "Senior Data Engineer", "company": "Acme",
+           "job_description": " ".join(f"Requirement {n}: Kafka, Terraform and Kubernetes." for n in range(scale)),
+           "company_research": "Acme builds logistics software."}
+    return profile, job
+
+
+def run(model, prompts):
+    start = time.perf_counter()
+    for _ in stream_documents(model, prompts):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake model latency with an empty prompt (s)")
+    parser.add_argument("--prefill", type=float, default=0.05, help="Extra fake latency per 1,000 input tokens (s)")
+    parser.add_argument("--scale", type=int, nargs="+", default=[20, 200], help="Profile size (experience lines)")
+    args = parser.parse_args()
+
+    print(f"{'scale':>6} {'mode':>9} {'input tokens':>13} {'reused':>8} {'batch s':>8}")
+    for scale in args.scale:
+        profile, job = make_inputs(scale)
+        context, _ = build_profile_context(profile, job)
+        instructions = {
+            "resume": resume_instructions("Chronological"),
+            "cover_letter": cover_letter_instructions("Professional"),
+            "ats_analysis": ats_analysis_instructions(score_resume(profile_text(profile), job["job_description"])),
+        }
+
+        model = FakeModel(latency=args.latency, prefill_per_1k=args.prefill)
+        elapsed = run(model, {doc_type: f"{context}\n\n{text}" for doc_type, text in instructions.items()})
+        print(f"{scale:>6} {'separate':>9} {model.input_tokens:>13} {0:>8} {elapsed:>8.2f}")
+
+        for mode, min_tokens in (("prefix", float("inf")), ("cached", 0)):
+            model = FakeModel(latency=args.latency, prefill_per_1k=args.prefill)
+            bound, prompts, stats = share_context(model, context, instructions, min_tokens=min_tokens,
+                                                  cache_factory=lambda m, c: m.cache_context(c))
+            elapsed = run(bound, prompts)
+            print(f"{scale:>6} {mode:>9} {model.input_tokens:>13} {stats['reused_tokens']:>8} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
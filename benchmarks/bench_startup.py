@@ -0,0 +1,76 @@
+"""
+Measure cold-start import time and resident memory of the app's modules.
+
+Usage: python -m benchmarks.bench_startup [--importtime]
+
+Each scenario runs in a fresh interpreter. "eager" imports what app.py used
+to load up front (Gemini SDK, pandas) plus every document parser; "lazy"
+imports the app modules and extracts a plain-text upload, which is all a
+session that never uploads a PDF/DOCX/ODT/CSV needs.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{code}
+elapsed = (time.perf_counter() - start) * 1000
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+heavy = [m for m in ("google.generativeai", "pandas", "PyPDF2", "docx", "odf") if m in sys.modules]
+print(json.dumps({{"ms": elapsed, "rss_mb": rss, "heavy": heavy}}))
+"""
+
+SCENARIOS = {
+    "eager": (
+        "import streamlit, google.generativeai, pandas, PyPDF2, docx, odf.opendocument, odf.text\n"
+        "import views.common, views.create, generation, extractors\n"
+    ),
+    "lazy": (
+        "import io\n"
+        "import streamlit\n"
+        "import views.common, views.create, generation, extractors\n"
+        "f = io.BytesIO(b'Python developer'); f.type = 'text/plain'; f.name = 'cv.txt'\n"
+        "extractors.extract_text(f)\n"
+    ),
+}
+
+
+def run(code, importtime=False):
+    flags = ["-X", "importtime"] if importtime else []
+    proc = subprocess.run([sys.executable, *flags, "-c", PROBE.format(code=code)],
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def top_imports(stderr, limit=10):
+    """Slowest top-level packages from `-X importtime` output, by cumulative time."""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if "." not in name:
+            totals[name] = max(totals.get(name, 0), int(cumulative_us))
+    return sorted(((us, name) for name, us in totals.items()), reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--importtime", action="store_true", help="Also list the slowest top-level imports")
+    args = parser.parse_args()
+
+    for label, code in SCENARIOS.items():
+        result, stderr = run(code, args.importtime)
+        print(f"{label:>6}: {result['ms']:8.1f} ms  {result['rss_mb']:7.1f} MB  loaded: {', '.join(result['heavy']) or '-'}")
+        if args.importtime:
+            for cumulative_us, name in top_imports(stderr):
+                print(f"        {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
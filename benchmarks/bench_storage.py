@@ -0,0 +1,76 @@
+"""
+History storage: insert throughput (row by row vs bulk), page load and search time.
+
+Usage: python -m benchmarks.bench_storage [--entries N ...] [--page-size N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+from benchmarks.fixtures import SAMPLE_LINE
+from storage import MemoryStorage, SQLiteStorage
+
+
+def make_entries(count):
+    document = "\n".join(f"- {SAMPLE_LINE}" for _ in range(60))
+    return [{
+        "id": str(uuid.uuid4()),
+        "timestamp": f"2024-01-01 00:{number // 60 % 60:02d}:{number % 60:02d}.{number:06d}",
+        "job_title": f"Engineer {number % 17}",
+        "company": f"Company {number % 50}",
+        "results": {"resume": document, "cover_letter": document},
+    } for number in range(count)]
+
+
+def load_page(storage, page_size):
+    start = time.perf_counter()
+    for summary in storage.list_history(storage.count_history() // 2, page_size):
+        storage.get_history(summary["id"])
+    return (time.perf_counter() - start) * 1000
+
+
+def search(storage, query, page_size):
+    start = time.perf_counter()
+    storage.count_history(query)
+    storage.list_history(0, page_size, query)
+    return (time.perf_counter() - start) * 1000
+
+
+def report(count, backend, insert_seconds, storage, page_size):
+    print(f"{count:>8} {backend:>14} {insert_seconds:>9.3f} {load_page(storage, page_size):>8.2f} "
+          f"{search(storage, 'company 7', page_size):>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[100, 1000, 10000], help="History sizes")
+    parser.add_argument("--page-size", type=int, default=10, help="Entries per History page")
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'backend':>14} {'insert s':>9} {'page ms':>8} {'search ms':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.entries:
+            entries = make_entries(count)
+
+            storage = MemoryStorage()
+            start = time.perf_counter()
+            storage.add_history_many(entries)
+            report(count, "memory", time.perf_counter() - start, storage, args.page_size)
+
+            storage = SQLiteStorage(os.path.join(directory, f"rows-{count}.db"))
+            start = time.perf_counter()
+            for entry in entries:
+                storage.add_history(entry)
+            report(count, "sqlite rows", time.perf_counter() - start, storage, args.page_size)
+
+            storage = SQLiteStorage(os.path.join(directory, f"bulk-{count}.db"))
+            start = time.perf_counter()
+            storage.add_history_many(entries)
+            report(count, "sqlite bulk", time.perf_counter() - start, storage, args.page_size)
+
+
+if __name__ == "__main__":
+    main()
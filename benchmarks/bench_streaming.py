@@ -0,0 +1,34 @@
+"""
+Compare time-to-first-token of streamed generation with blocking generation.
+
+Usage: python -m benchmarks.bench_streaming [--latency SECONDS] [--chunks N]
+"""
+
+import argparse
+import time
+
+from benchmarks.fake_gemini import FakeModel
+from generation import stream_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=2.0, help="Fake model latency per call (s)")
+    parser.add_argument("--chunks", type=int, default=20, help="Chunks per streamed response")
+    args = parser.parse_args()
+
+    model = FakeModel(latency=args.latency, chunks=args.chunks)
+
+    start = time.perf_counter()
+    model.generate_content("prompt").text
+    blocking = time.perf_counter() - start
+    print(f"blocking: first text after {blocking:.3f}s")
+
+    timings = {}
+    for _ in stream_text(model, "prompt", timings=timings):
+        pass
+    print(f"streamed: first token after {timings['ttft']:.3f}s, complete after {timings['total']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Pass/fail check of the batch CLI against the local fake Gemini server.
+
+Runs `batch.run_batch` over HTTP with a fraction of requests answered with
+429 and asserts that every posting still succeeds (the rate limits were
+retried), that each posting is written exactly once, and that a run cut off
+mid-write resumes from the checkpoint without redoing finished postings.
+Uses the real SDK when it is installed, else a minimal stdlib REST model.
+Exits non-zero on the first failed check.
+
+Usage: python -m benchmarks.check_batch [--jobs N] [--error-rate FRACTION]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import urllib.request
+
+import generation
+from batch import read_jobs, run_batch
+from benchmarks.bench_batch import write_jobs
+from benchmarks.bench_shared_context import make_inputs
+from benchmarks.fake_gemini_server import FakeGeminiServer
+from client import GeminiClient
+
+
+class RestResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class RestModel:
+    """Non-streaming `generateContent` over urllib; HTTP errors keep their status as `code`, like the SDK's."""
+
+    def __init__(self, endpoint, model_name):
+        self.url = f"{endpoint}/v1beta/models/{model_name}:generateContent"
+
+    def generate_content(self, contents, **kwargs):
+        parts = contents if isinstance(contents, list) else [contents]
+        body = json.dumps({"contents": [{"role": "user", "parts": [{"text": str(part)} for part in parts]}]})
+        request = urllib.request.Request(self.url, data=body.encode("utf-8"),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request) as response:
+            data = json.load(response)
+        return RestResponse("".join(part["text"] for part in data["candidates"][0]["content"]["parts"]))
+
+
+def model_factory(endpoint):
+    try:
+        import google.generativeai  # noqa: F401
+    except ImportError:
+        return lambda api_key, model_name: RestModel(endpoint, model_name)
+    generation.API_ENDPOINT = endpoint
+    return generation.get_model
+
+
+def read_records(path):
+    """Complete JSON lines of the output; a line cut off by an interrupted run is skipped."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def check_batch(jobs, error_rate):
+    server = FakeGeminiServer(latency=0.01, error_rate=error_rate).start()
+    try:
+        client = GeminiClient("fake-key", requests_per_minute=100_000, retries=8, base_delay=0.01,
+                              model_factory=model_factory(server.endpoint))
+        profile, _ = make_inputs(5)
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs_path = os.path.join(tmp, "jobs.jsonl")
+            out_path = os.path.join(tmp, "out.jsonl")
+            write_jobs(jobs_path, jobs)
+            ids = {job["id"] for job in read_jobs(jobs_path)}
+
+            stats = run_batch(client, profile, read_jobs(jobs_path), out_path, concurrency=4, restart=True)
+            assert server.errors > 0, "no 429 was injected; raise --error-rate"
+            assert stats["failed"] == 0, f"{stats['failed']} postings failed despite retries"
+            records = read_records(out_path)
+            assert sorted(record["id"] for record in records) == sorted(ids), "every posting written exactly once"
+            assert all(record["results"] and record["error"] is None for record in records)
+            print(f"ok: {jobs} postings, {server.errors} rate limits retried")
+
+            # Simulate a run killed after five postings, in the middle of writing the sixth
+            with open(out_path, encoding="utf-8") as f:
+                lines = f.readlines()
+            with open(out_path, "w", encoding="utf-8") as f:
+                f.writelines(lines[:5])
+                f.write(lines[5][:len(lines[5]) // 2])
+            calls = server.calls
+
+            again = run_batch(client, profile, read_jobs(jobs_path), out_path, concurrency=4)
+            assert again["skipped"] == 5, f"resume skipped {again['skipped']} postings, expected 5"
+            assert again["jobs"] == jobs - 5 and again["failed"] == 0
+            assert server.calls > calls
+            records = read_records(out_path)
+            assert sorted(record["id"] for record in records) == sorted(ids), "resumed output has every posting once"
+            print(f"ok: resumed after 5 postings, {again['jobs']} generated")
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20, help="Postings per run (at least 6)")
+    parser.add_argument("--error-rate", type=float, default=0.3, help="Fraction of requests failing with 429")
+    args = parser.parse_args()
+    check_batch(args.jobs, args.error_rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Local stand-in for `genai.GenerativeModel` used by the benchmarks.
+
+It never touches the network: each call sleeps for a configurable latency
+and returns a canned response, so timings reflect only our own code paths.
+`install_fake_sdk` registers a fake `google.generativeai` module whose
+GenerativeModel is a FakeModel, so the unmodified app (e.g. under
+Streamlit's AppTest) runs offline without an API key.
+"""
+
+import random
+import sys
+import threading
+import time
+import types
+
+from prompts import estimate_tokens
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeAPIError(Exception):
+    """Stand-in for a google.api_core error; `code` is the HTTP status."""
+
+    def __init__(self, code=429, message="Resource has been exhausted (fake)"):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeModel:
+    """
+    `latency` is the time of a call with an empty prompt; `prefill_per_1k`
+    adds that many seconds per 1,000 input tokens. With `stream=True` the
+    response is split into `chunks` pieces spread evenly over that time.
+    `calls` and `input_tokens` count every request made through this model
+    or any model returned by `cache_context`. A fraction `error_rate` of the
+    calls raises FakeAPIError(429) after the latency, like a rate limit.
+    """
+
+    def __init__(self, model_name="gemini-2.0-flash", latency=0.5, chunks=8,
+                 response_text="Match: 72%\n\n# Fake Document\n\n- Generated offline.", prefill_per_1k=0.0,
+                 error_rate=0.0, seed=0):
+        self.model_name = f"models/{model_name}"
+        self.latency = latency
+        self.chunks = chunks
+        self.response_text = response_text
+        self.prefill_per_1k = prefill_per_1k
+        self.error_rate = error_rate
+        self.calls = 0
+        self.errors = 0
+        self.input_tokens = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._root = self
+
+    def cache_context(self, context):
+        """Stand-in for a CachedContent upload: `context` is counted once, not on each call."""
+        self._root.input_tokens += estimate_tokens(context)
+        bound = FakeModel(self.model_name.split("/", 1)[1], self.latency, self.chunks,
+                          self.response_text, self.prefill_per_1k, self.error_rate)
+        bound._root = self._root
+        return bound
+
+    def generate_content(self, contents, stream=False, **kwargs):
+        parts = contents if isinstance(contents, list) else [contents]
+        tokens = sum(estimate_tokens(str(part)) for part in parts)
+        root = self._root
+        with root._lock:
+            root.calls += 1
+            root.input_tokens += tokens
+            failed = root._random.random() < self.error_rate
+            root.errors += failed
+        latency = self.latency + self.prefill_per_1k * tokens / 1000
+        if stream:
+            return self._stream(latency, failed)
+        time.sleep(latency)
+        if failed:
+            raise FakeAPIError()
+        return FakeResponse(self.response_text)
+
+    def _stream(self, latency, failed=False):
+        if failed:
+            time.sleep(latency)
+            raise FakeAPIError()
+        text = self.response_text
+        size = max(1, -(-len(text) // self.chunks))
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        for piece in pieces:
+            time.sleep(latency / len(pieces))
+            yield FakeResponse(piece)
+
+
+def install_fake_sdk(**settings):
+    """
+    Make `import google.generativeai` return a fake SDK for the rest of the process.
+
+    Every GenerativeModel it creates is a FakeModel built with `settings`
+    (latency, chunks, response_text, error_rate, ...). Returns the list of
+    models created so far, which keeps growing as the app creates more.
+    """
+    created = []
+
+    class GenerativeModel(FakeModel):
+        def __init__(self, model_name="gemini-2.0-flash", **kwargs):
+            super().__init__(model_name, **{**settings, **kwargs})
+            created.append(self)
+
+    client = types.ModuleType("google.generativeai.client")
+    client.get_default_generative_client = lambda: None
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = GenerativeModel
+    genai.client = client
+
+    google = sys.modules.get("google")
+    if google is None:
+        try:
+            import google
+        except ImportError:
+            google = types.ModuleType("google")
+            google.__path__ = []
+            sys.modules["google"] = google
+    google.generativeai = genai
+    sys.modules["google.generativeai"] = genai
+    sys.modules["google.generativeai.client"] = client
+    return created
@@ -0,0 +1,134 @@
+"""
+Local HTTP stand-in for the Gemini REST API.
+
+Answers `POST /v1beta/models/<model>:generateContent` with a canned response
+after a configurable latency, and `:streamGenerateContent` (used by the
+Create and ATS Optimizer pages) with the same text in `chunks` pieces spread
+over that latency: as server-sent events with `alt=sse`, else as the JSON
+array the SDK's REST transport reads. A fraction of requests is answered
+with 429 RESOURCE_EXHAUSTED instead, so the real SDK can be exercised end to
+end without a key or network. Point the app or the batch CLI at it with
+GEMINI_API_ENDPOINT=http://127.0.0.1:<port>.
+
+Usage: python -m benchmarks.fake_gemini_server [--port PORT] [--latency SECONDS] [--chunks N] [--error-rate FRACTION]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESPONSE_TEXT = "Match: 72%\n\n# Fake Document\n\n- Generated offline."
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.2, error_rate=0.0, response_text=RESPONSE_TEXT, seed=0, chunks=8):
+        super().__init__(("127.0.0.1", port), FakeGeminiHandler)
+        self.latency = latency
+        self.chunks = chunks
+        self.error_rate = error_rate
+        self.response_text = response_text
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        """Serve from a daemon thread and return self; stop with shutdown()."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def response_body(text, finished=True):
+    candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+    if finished:
+        candidate["finishReason"] = "STOP"
+    return {"candidates": [candidate],
+            "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": 0, "totalTokenCount": 0}}
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path, _, query = self.path.partition("?")
+        stream = path.endswith(":streamGenerateContent")
+        if not stream and not path.endswith(":generateContent"):
+            self._reply(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+            return
+
+        server = self.server
+        with server._lock:
+            server.calls += 1
+            failed = server._random.random() < server.error_rate
+            server.errors += failed
+        if failed:
+            time.sleep(server.latency)
+            self._reply(429, {"error": {"code": 429, "message": "Resource has been exhausted (fake)",
+                                        "status": "RESOURCE_EXHAUSTED"}})
+        elif stream:
+            self._stream("alt=sse" in query)
+        else:
+            time.sleep(server.latency)
+            self._reply(200, response_body(server.response_text))
+
+    def _stream(self, sse):
+        server = self.server
+        text = server.response_text
+        count = max(1, server.chunks)
+        size = -(-len(text) // count)
+        pieces = [text[start:start + size] for start in range(0, len(text), size)] or [""]
+        # No Content-Length: the body ends when the connection closes (HTTP/1.0)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/json")
+        self.end_headers()
+        if not sse:
+            self.wfile.write(b"[")
+        for number, piece in enumerate(pieces):
+            time.sleep(server.latency / len(pieces))
+            data = json.dumps(response_body(piece, finished=number == len(pieces) - 1))
+            if sse:
+                self.wfile.write(f"data: {data}\r\n\r\n".encode("utf-8"))
+            else:
+                self.wfile.write((("," if number else "") + data).encode("utf-8"))
+            self.wfile.flush()
+        if not sse:
+            self.wfile.write(b"]")
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.2, help="Delay before each response (s)")
+    parser.add_argument("--chunks", type=int, default=8, help="Chunks per streamed response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(args.port, args.latency, args.error_rate, chunks=args.chunks)
+    print(f"Serving fake Gemini API on {server.endpoint}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
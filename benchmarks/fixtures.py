@@ -0,0 +1,106 @@
+"""
+Synthetic upload fixtures for the extraction benchmarks.
+
+Every builder returns a file-like object carrying the `name` and `type`
+attributes that Streamlit's UploadedFile exposes.
+"""
+
+import csv
+import io
+
+SAMPLE_LINE = "Senior Python developer building data pipelines with SQL, Docker and AWS."
+
+
+def as_upload(data, name, mime_type):
+    upload = io.BytesIO(data)
+    upload.name = name
+    upload.type = mime_type
+    return upload
+
+
+def make_pdf(pages, lines_per_page=40):
+    """Build a plain PDF with `pages` pages of Helvetica text (no third-party libraries)."""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages_obj = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    kids = []
+    for number in range(pages):
+        lines = [f"({SAMPLE_LINE} Page {number + 1} line {line + 1}.) Tj T*" for line in range(lines_per_page)]
+        stream = ("BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(lines) + " ET").encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_obj, font, content)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    objects[pages_obj - 1] = (b"<< /Type /Pages /Count %d /Kids [" % pages
+                              + b" ".join(b"%d 0 R" % kid for kid in kids) + b"] >>")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+def make_docx(paragraphs):
+    import docx
+
+    document = docx.Document()
+    for number in range(paragraphs):
+        document.add_paragraph(f"{SAMPLE_LINE} Paragraph {number + 1}.")
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def make_odt(paragraphs):
+    from odf.opendocument import OpenDocumentText
+    from odf.text import H, P
+
+    document = OpenDocumentText()
+    for number in range(paragraphs):
+        # A heading every ten paragraphs, like the sections of a real resume
+        if number % 10 == 0:
+            document.text.addElement(H(outlinelevel=1, text=f"Section {number // 10 + 1}"))
+        document.text.addElement(P(text=f"{SAMPLE_LINE} Paragraph {number + 1}."))
+    out = io.BytesIO()
+    document.write(out)
+    return out.getvalue()
+
+
+def make_csv(rows):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["job_description", "company"])
+    for number in range(rows):
+        writer.writerow([f"Posting {number + 1}: we need a {SAMPLE_LINE.lower()}", f"Company {number + 1}"])
+    return out.getvalue().encode("utf-8")
+
+
+BUILDERS = {
+    "pdf": (make_pdf, "application/pdf"),
+    "docx": (make_docx, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "odt": (make_odt, "application/vnd.oasis.opendocument.text"),
+    "csv": (make_csv, "text/csv"),
+}
+
+
+def make_upload(kind, size):
+    builder, mime_type = BUILDERS[kind]
+    return as_upload(builder(size), f"fixture.{kind}", mime_type)
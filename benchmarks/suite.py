@@ -0,0 +1,244 @@
+"""
+Offline benchmark suite: the whole app against a fake Gemini SDK, results as JSON.
+
+Installs the fake `google.generativeai` from fake_gemini.py (configurable
+latency, streamed chunks and injected errors) and drives the real app with
+Streamlit's AppTest:
+
+- rerun: script rerun time of every page (median / p95 ms)
+- flows: end-to-end time of the Create generation, the rerun that
+  serves its downloads, and the ATS Optimizer analysis and optimized rewrite
+- extraction: throughput of the PDF/DOCX/ODT/CSV fixtures, uncapped
+- memory: tracemalloc peak of each flow and extraction, and the max RSS
+
+Results are written as JSON with the commit they were measured on; pass
+--compare with an earlier file to print the change of every metric.
+
+Usage: python -m benchmarks.suite [--out results.json] [--compare before.json] [--runs N] [--latency SECONDS]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from benchmarks.bench_shared_context import make_inputs
+from benchmarks.fake_gemini import install_fake_sdk
+from benchmarks.fixtures import make_upload
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+PAGES = ["Create Resume & Cover Letter", "Profile Manager", "History", "ATS Optimizer"]
+
+# Fixture kind -> size (pages, paragraphs or rows)
+EXTRACTION_FIXTURES = {"pdf": 50, "docx": 500, "odt": 500, "csv": 1000}
+
+TEXT_AREAS = ("objective", "experience", "skills", "education", "certifications", "job_description", "company_research")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(APP), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(samples):
+    return {"median_ms": round(statistics.median(samples), 1),
+            "p95_ms": round(sorted(samples)[int(0.95 * (len(samples) - 1))], 1), "runs": len(samples)}
+
+
+def peak_mb(func):
+    """Run `func()` under tracemalloc; returns (result, peak MB)."""
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+    finally:
+        tracemalloc.stop()
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed
+
+
+def click(at, label):
+    """Click the button labelled `label` and time the rerun it triggers."""
+    next(button for button in at.button if button.label == label).click()
+    return timed_run(at)
+
+
+def open_page(page):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120).run()
+    at.sidebar.text_input[0].set_value("fake-key")
+    # Every run reaches the fake model instead of the response cache
+    at.sidebar.checkbox[0].check()
+    at.sidebar.selectbox[0].set_value(page).run()
+    return at
+
+
+def create_flow():
+    """Fill the Create page, generate, then rerun once more; returns {"generate_ms", "export_ms", "downloads"}."""
+    at = open_page("Create Resume & Cover Letter")
+    profile, job = make_inputs(20)
+    for key, value in {**profile, **job}.items():
+        widget = at.text_area(key=key) if key in TEXT_AREAS else at.text_input(key=key)
+        widget.set_value(value)
+    at.multiselect[0].set_value(["Resume", "Cover Letter", "ATS Analysis"])
+    generate_ms = click(at, "🚀 Generate Documents")
+    # Downloads are shown for the saved entry on every rerun; the second one serves the files from the export cache
+    export_ms = timed_run(at)
+    return {"generate_ms": generate_ms, "export_ms": export_ms, "downloads": len(at.get("download_button"))}
+
+
+def ats_flow():
+    """Analyze a resume on the ATS Optimizer, then generate the optimized resume."""
+    at = open_page("ATS Optimizer")
+    profile, job = make_inputs(20)
+    at.text_area[0].set_value(profile["experience"] + "\n" + profile["skills"])
+    at.text_area[1].set_value(job["job_description"])
+    analyze_ms = click(at, "🔍 Analyze ATS Compatibility")
+    optimize_ms = click(at, "✨ Generate Optimized Resume")
+    return {"analyze_ms": analyze_ms, "optimize_ms": optimize_ms, "downloads": len(at.get("download_button"))}
+
+
+def bench_rerun(runs):
+    from benchmarks.bench_rerun import time_page
+
+    return {page: summarize(time_page(APP, page, runs)[0]) for page in PAGES}
+
+
+def bench_flows(runs):
+    results = {}
+    for name, flow in (("create", create_flow), ("ats", ats_flow)):
+        samples = [flow() for _ in range(runs)]
+        row = {}
+        for metric in samples[0]:
+            values = [sample[metric] for sample in samples if sample[metric] is not None]
+            if metric.endswith("_ms"):
+                row[metric] = summarize(values) if values else None
+            else:
+                row[metric] = samples[-1][metric]
+        results[name] = row
+    return results
+
+
+def bench_extraction(runs):
+    from extractors import extract
+
+    results = {}
+    for kind, size in EXTRACTION_FIXTURES.items():
+        samples = []
+        try:
+            for _ in range(runs):
+                upload = make_upload(kind, size)
+                start = time.perf_counter()
+                _, stats = extract(upload, max_pages=None, max_chars=None)
+                samples.append(time.perf_counter() - start)
+        except ImportError as e:
+            results[kind] = {"skipped": f"missing dependency: {e.name}"}
+            continue
+        megabytes = len(upload.getvalue()) / (1024 * 1024)
+        seconds = statistics.median(samples)
+        results[kind] = {"size": size, "mb": round(megabytes, 3), "median_ms": round(seconds * 1000, 1),
+                         "mb_per_s": round(megabytes / seconds, 2), "segments_per_s": round(stats["pages"] / seconds),
+                         "chars_per_s": round(stats["chars"] / seconds)}
+    return results
+
+
+def bench_memory():
+    from extractors import extract
+
+    results = {}
+    for name, flow in (("create_flow", create_flow), ("ats_flow", ats_flow)):
+        try:
+            results[name] = peak_mb(flow)[1]
+        except ImportError:
+            break
+    for kind, size in EXTRACTION_FIXTURES.items():
+        try:
+            upload = make_upload(kind, size)
+            results[f"extract_{kind}"] = peak_mb(lambda: extract(upload, max_pages=None, max_chars=None))[1]
+        except ImportError:
+            continue
+    results["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return results
+
+
+def flatten(data, prefix=""):
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten(value, name + ".")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+def compare(before, after):
+    old = dict(flatten(before["results"]))
+    print(f"\nvs {before.get('commit') or 'baseline'} ({before.get('timestamp', '?')})")
+    print(f"{'metric':<58} {'before':>10} {'after':>10} {'change':>8}")
+    for name, value in flatten(after["results"]):
+        if name in old and old[name]:
+            print(f"{name:<58} {old[name]:>10} {value:>10} {(value - old[name]) / old[name]:>+8.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", default="bench_results.json", help="JSON file to write")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per measurement")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake model latency per request (s)")
+    parser.add_argument("--chunks", type=int, default=8, help="Chunks per streamed fake response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake requests failing with 429")
+    parser.add_argument("--sections", nargs="+", default=["rerun", "flows", "extraction", "memory"],
+                        choices=["rerun", "flows", "extraction", "memory"], help="Sections to run")
+    args = parser.parse_args()
+
+    # The shared client's default quota would throttle a long run against the fake
+    os.environ.setdefault("GEMINI_RPM", "100000")
+    os.environ.pop("GEMINI_API_ENDPOINT", None)
+    install_fake_sdk(latency=args.latency, chunks=args.chunks, error_rate=args.error_rate)
+
+    sections = {"rerun": lambda: bench_rerun(args.runs), "flows": lambda: bench_flows(args.runs),
+                "extraction": lambda: bench_extraction(args.runs), "memory": bench_memory}
+    results = {}
+    for name in args.sections:
+        print(f"running {name}...")
+        try:
+            results[name] = sections[name]()
+        except ImportError as e:
+            results[name] = {"skipped": f"missing dependency: {e.name}"}
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "settings": {"runs": args.runs, "latency": args.latency, "chunks": args.chunks, "error_rate": args.error_rate},
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"written to {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Process-wide Gemini client with a shared quota.
+
+`GeminiClient` stands in for a `genai.GenerativeModel` (it has `model_name`
+and `generate_content`, so every helper in generation.py accepts it). One
+client is created per API key and shared by every session of the process,
+so concurrent users draw from one quota instead of each hammering the API:
+
+- Two token buckets cap requests per minute and (estimated) input tokens
+  per minute; callers block until their request fits.
+- Rate-limited and transient errors are retried with jittered exponential
+  backoff (`generation.call_with_retries`).
+- Each model has a circuit breaker. After BREAKER_THRESHOLD consecutive
+  failed calls it opens and calls fail fast (or go to the next model) for
+  BREAKER_RESET seconds, then a single trial call decides whether it closes.
+- When a model fails after its retries, the call falls back to the next of
+  FALLBACK_MODELS. Responses keep the cache key of the primary model.
+
+SDK models, and with them their HTTP/gRPC connections, are built on first
+use and reused for every later call. `bind_context` returns a client whose
+primary model reads a Gemini cached context; it shares the quota, breakers
+and counters of the client it came from.
+"""
+
+import copy
+import logging
+import os
+import threading
+import time
+
+from generation import DEFAULT_MODEL, RETRY_STATUS, call_with_retries, error_status, get_model
+from prompts import prompt_tokens
+
+logger = logging.getLogger(__name__)
+
+MODEL = os.environ.get("GEMINI_MODEL", DEFAULT_MODEL)
+FALLBACK_MODELS = tuple(name.strip() for name in os.environ.get("GEMINI_FALLBACK_MODELS", "").split(",") if name.strip())
+
+REQUESTS_PER_MINUTE = int(os.environ.get("GEMINI_RPM", 60))
+TOKENS_PER_MINUTE = int(os.environ.get("GEMINI_TPM", 1_000_000))
+RETRIES = int(os.environ.get("GEMINI_RETRIES", 4))
+RETRY_BASE_DELAY = float(os.environ.get("GEMINI_RETRY_DELAY", 1.0))
+BREAKER_THRESHOLD = int(os.environ.get("GEMINI_BREAKER_THRESHOLD", 5))
+BREAKER_RESET = float(os.environ.get("GEMINI_BREAKER_RESET", 30))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a model whose circuit breaker is open."""
+
+    def __init__(self, model_name, retry_in):
+        super().__init__(f"{model_name} is failing repeatedly; calls are paused for {retry_in:.0f}s")
+        self.model_name = model_name
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Refills `per_minute` tokens a minute, holding at most `capacity` (default: one minute's worth)."""
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """Take `amount` tokens (at most `capacity`), sleeping until they are available."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; after `reset_timeout` seconds one trial call is let through."""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def retry_in(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._trial and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                if self._opened_at is None or self._trial:
+                    logger.warning("Circuit opened after %d consecutive failures", self.failures)
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+def _prepend(first, chunks):
+    if first is not None:
+        yield first
+    yield from chunks
+
+
+class GeminiClient:
+    """
+    Rate-limited, retrying stand-in for a GenerativeModel; see the module docstring.
+
+    `model_factory(api_key, model_name)` builds the SDK models (get_model by
+    default). Counters in `stats()` cover every call made through the client.
+    """
+
+    def __init__(self, api_key, model_name=MODEL, fallback_models=FALLBACK_MODELS,
+                 requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE, retries=RETRIES,
+                 base_delay=RETRY_BASE_DELAY, breaker_threshold=BREAKER_THRESHOLD, breaker_reset=BREAKER_RESET,
+                 model_factory=get_model):
+        self.api_key = api_key
+        self.model_name = f"models/{model_name}"
+        self.models = [model_name] + [name for name in fallback_models if name != model_name]
+        self.retries = retries
+        self.base_delay = base_delay
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.breakers = {name: CircuitBreaker(breaker_threshold, breaker_reset) for name in self.models}
+        self._factory = model_factory
+        self._sdk_models = {}
+        self._context = None
+        self._counts = {"calls": 0, "attempts": 0, "fallbacks": 0, "failures": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _sdk_model(self, name):
+        with self._lock:
+            model = self._sdk_models.get(name)
+            if model is None:
+                model = self._sdk_models[name] = self._factory(self.api_key, name)
+            return model
+
+    def bind_context(self, context, cached_model):
+        """
+        A client whose primary model is `cached_model`, an SDK model bound to
+        cached content holding `context`. Fallback models cannot read that
+        cache, so they get `context` as the first part of each request.
+        """
+        bound = copy.copy(self)
+        bound._sdk_models = {**self._sdk_models, self.models[0]: cached_model}
+        bound._context = context
+        return bound
+
+    def _contents(self, name, contents):
+        if self._context is None or name == self.models[0]:
+            return contents
+        return [self._context] + (contents if isinstance(contents, list) else [contents])
+
+    def _attempt(self, name, contents, kwargs):
+        contents = self._contents(name, contents)
+        self.request_bucket.acquire()
+        self.token_bucket.acquire(prompt_tokens(contents))
+        self._count("attempts")
+        response = self._sdk_model(name).generate_content(contents, **kwargs)
+        if not kwargs.get("stream"):
+            return response
+        # A streamed call reports most errors with its first chunk; read it here so they are retried too
+        chunks = iter(response)
+        return _prepend(next(chunks, None), chunks)
+
+    def generate_content(self, contents, **kwargs):
+        """Call the first model whose breaker allows it, falling back to the next one on failure."""
+        self._count("calls")
+        error = None
+        for name in self.models:
+            breaker = self.breakers[name]
+            if not breaker.allow():
+                error = error or CircuitOpenError(name, breaker.retry_in())
+                continue
+            try:
+                response = call_with_retries(lambda: self._attempt(name, contents, kwargs),
+                                             self.retries, self.base_delay)
+            except Exception as e:
+                if error_status(e) not in RETRY_STATUS:
+                    # The request itself is at fault (bad input, blocked prompt): no fallback
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                self._count("failures")
+                error = e
+                logger.warning("%s failed after %d retries: %s", name, self.retries, e)
+                continue
+            breaker.record_success()
+            if name != self.models[0]:
+                self._count("fallbacks")
+                logger.info("Served by fallback model %s", name)
+            return response
+        raise error
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counts)
+        stats["open_circuits"] = [name for name, breaker in self.breakers.items() if breaker.retry_in() > 0]
+        return stats
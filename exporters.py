@@ -0,0 +1,364 @@
+"""
+Export of generated documents as Text, Markdown, JSON, DOCX and PDF.
+
+Exporters are registered per format key, like the parsers in extractors.py.
+Each takes a history entry and returns the file as bytes, with every
+document of the entry in one file. DOCX is written with python-docx
+(imported on first use) and PDF with the small renderer below, which only
+needs the standard library: the PDF base-14 Helvetica fonts, word wrapping
+from their glyph widths, and Flate-compressed page streams.
+
+Both rich formats share one Markdown reader that understands what the model
+writes in practice: headings, bullet and numbered lists, horizontal rules and
+**bold** / *italic* runs. Anything else is kept as plain text.
+
+Entries never change once saved, so `export_cached` renders each format of
+an entry once and keeps the bytes in an LRUCache keyed by entry id.
+`write_history_zip` writes a whole history into a ZIP file one entry at a
+time, so only one entry is held in memory.
+"""
+
+import json
+import re
+import zipfile
+import zlib
+from collections import namedtuple
+from io import BytesIO
+
+from metrics import timed
+
+# Bump when exporter output changes so cached files are not reused
+EXPORT_VERSION = 1
+
+TITLES = {"resume": "Resume", "cover_letter": "Cover Letter", "ats_analysis": "ATS Analysis"}
+
+ExportFormat = namedtuple("ExportFormat", "label extension mime render")
+
+# Format key -> ExportFormat, in the order the download buttons are shown
+FORMATS = {}
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+RULE_RE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+BULLET_RE = re.compile(r"^(\s*)[-*+•]\s+(.*)$")
+NUMBER_RE = re.compile(r"^(\s*)(\d+)[.)]\s+(.*)$")
+INLINE_RE = re.compile(r"\*\*(.+?)\*\*|__(.+?)__|\*([^*\s][^*]*?)\*|`([^`]+)`|\[([^\]]+)\]\(([^)\s]+)\)")
+
+
+def register(key, label, extension, mime):
+    """Register the decorated function(entry) -> bytes as the exporter for `key`."""
+    def decorator(func):
+        FORMATS[key] = ExportFormat(label, extension, mime, func)
+        return func
+    return decorator
+
+
+def documents(entry):
+    """(title, markdown) of each generated document of an entry."""
+    return [(TITLES.get(doc_type, doc_type), text) for doc_type, text in (entry.get("results") or {}).items()]
+
+
+def parse_markdown(text):
+    """
+    Yield the blocks of `text`, one per non-empty line, as (kind, level, runs).
+
+    kind is "heading" (level 1-6), "bullet" or "number" (level = nesting
+    depth from 0, runs starting with the marker text for numbers), "rule"
+    or "paragraph". runs is a list of (text, bold, italic).
+    """
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        match = HEADING_RE.match(line)
+        if match:
+            yield "heading", len(match.group(1)), inline_runs(match.group(2))
+            continue
+        if RULE_RE.match(line):
+            yield "rule", 0, []
+            continue
+        match = BULLET_RE.match(line)
+        if match:
+            yield "bullet", len(match.group(1).expandtabs(4)) // 2, inline_runs(match.group(2))
+            continue
+        match = NUMBER_RE.match(line)
+        if match:
+            yield "number", len(match.group(1).expandtabs(4)) // 2, [(f"{match.group(2)}. ", False, False)] + \
+                inline_runs(match.group(3))
+            continue
+        yield "paragraph", 0, inline_runs(line.strip())
+
+
+def inline_runs(text):
+    """Split **bold**, __bold__, *italic*, `code` and [links](url) into (text, bold, italic) runs."""
+    runs = []
+    position = 0
+    for match in INLINE_RE.finditer(text):
+        if match.start() > position:
+            runs.append((text[position:match.start()], False, False))
+        bold, bold_alt, italic, code, link_text, url = match.groups()
+        if bold or bold_alt:
+            runs.append((bold or bold_alt, True, False))
+        elif italic:
+            runs.append((italic, False, True))
+        elif code:
+            runs.append((code, False, False))
+        else:
+            runs.append((f"{link_text} ({url})" if link_text != url else url, False, False))
+        position = match.end()
+    if position < len(text):
+        runs.append((text[position:], False, False))
+    return runs
+
+
+@register("txt", "Text", "txt", "text/plain")
+def export_text(entry):
+    return "\n\n".join(f"--- {title.upper()} ---\n\n{text}" for title, text in documents(entry)).encode("utf-8")
+
+
+@register("md", "Markdown", "md", "text/markdown")
+def export_markdown(entry):
+    return "\n\n".join(f"# {title}\n\n{text}" for title, text in documents(entry)).encode("utf-8")
+
+
+@register("json", "JSON", "json", "application/json")
+def export_json(entry):
+    return json.dumps(entry.get("results") or {}, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+@register("docx", "Word", "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+def export_docx(entry):
+    import docx
+    from docx.enum.text import WD_BREAK
+
+    document = docx.Document()
+    for number, (title, text) in enumerate(documents(entry)):
+        if number:
+            document.paragraphs[-1].add_run().add_break(WD_BREAK.PAGE)
+        document.add_heading(title, level=0)
+        for kind, level, runs in parse_markdown(text):
+            if kind == "heading":
+                paragraph = document.add_heading(level=min(level, 9))
+            elif kind == "rule":
+                continue
+            elif kind == "bullet":
+                paragraph = document.add_paragraph(style="List Bullet" + (f" {min(level, 2) + 1}" if level else ""))
+            elif kind == "number":
+                paragraph = document.add_paragraph(style="List Number" + (f" {min(level, 2) + 1}" if level else ""))
+                runs = runs[1:]  # Word numbers the list itself
+            else:
+                paragraph = document.add_paragraph()
+            for run_text, bold, italic in runs:
+                run = paragraph.add_run(run_text)
+                run.bold = bold or None
+                run.italic = italic or None
+
+    out = BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+# Advance widths (1/1000 em) of the printable ASCII characters, from the Adobe AFM files
+HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+HELVETICA_BOLD_WIDTHS = [
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+]
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN = 56
+BODY_SIZE = 10.5
+HEADING_SIZES = {0: 18, 1: 15, 2: 13}  # document title, then Markdown heading levels; deeper levels use 11.5
+
+
+def text_width(text, size, bold=False):
+    widths = HELVETICA_BOLD_WIDTHS if bold else HELVETICA_WIDTHS
+    return sum(widths[ord(char) - 32] if 32 <= ord(char) <= 126 else 556 for char in text) * size / 1000
+
+
+def _pdf_string(text):
+    data = text.encode("cp1252", "replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+class PDFRenderer:
+    """Lays out lines of (text, bold) runs top to bottom on A4 pages and writes the PDF."""
+
+    def __init__(self):
+        self.pages = []
+        self._ops = None
+        self.y = 0
+
+    def new_page(self):
+        self._ops = []
+        self.pages.append(self._ops)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def space(self, points):
+        self.y -= points
+
+    def _ensure(self, height):
+        if self._ops is None or self.y - height < MARGIN:
+            self.new_page()
+
+    def rule(self):
+        self._ensure(12)
+        self.y -= 6
+        self._ops.append(b"0.5 w %d %.2f m %d %.2f l S" % (MARGIN, self.y, PAGE_WIDTH - MARGIN, self.y))
+        self.y -= 6
+
+    def paragraph(self, runs, size=BODY_SIZE, indent=0, marker=None):
+        """Word-wrap `runs` ((text, bold) pairs) between the margins; `marker` hangs left of the first line."""
+        left = MARGIN + indent
+        width = PAGE_WIDTH - MARGIN - left
+        lines, line, line_width = [], [], 0.0
+        for text, bold in runs:
+            for word in re.findall(r"\s+|\S+", text):
+                if word.isspace():
+                    # Spaces stick to the previous word, so runs like "**Email:** x" keep theirs
+                    if line and not line[-1][0].endswith(" "):
+                        line[-1] = (line[-1][0] + " ", line[-1][1])
+                        line_width += text_width(" ", size)
+                    continue
+                word_width = text_width(word, size, bold)
+                if line and line_width + word_width > width:
+                    lines.append(line)
+                    line, line_width = [], 0.0
+                line.append((word, bold))
+                line_width += word_width
+        if line:
+            lines.append(line)
+
+        leading = size * 1.35
+        for number, line in enumerate(lines):
+            self._ensure(leading)
+            self.y -= leading
+            parts = [b"BT %.2f %.2f Td" % (left, self.y)]
+            if marker and not number:
+                # Td moves the start of the line, so step back for the marker and forward again after it
+                offset = max(12, text_width(marker, size) + 3)
+                parts.append(b"/F1 %.1f Tf %.2f 0 Td %s Tj %.2f 0 Td" % (size, -offset, _pdf_string(marker), offset))
+            font = None
+            for word, bold in line:
+                if bold != font:
+                    parts.append(b"/F%d %.1f Tf" % (2 if bold else 1, size))
+                    font = bold
+                parts.append(_pdf_string(word) + b" Tj")
+            parts.append(b"ET")
+            self._ops.append(b" ".join(parts))
+
+    def render(self):
+        """The finished document as PDF bytes."""
+        if not self.pages:
+            self.new_page()
+        objects = [None, None,
+                   b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+                   b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>"]
+        kids = []
+        for ops in self.pages:
+            stream = zlib.compress(b"\n".join(ops))
+            objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+            objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                           b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+                           % (PAGE_WIDTH, PAGE_HEIGHT, len(objects)))
+            kids.append(len(objects))
+        objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+        objects[1] = (b"<< /Type /Pages /Count %d /Kids [" % len(kids)
+                      + b" ".join(b"%d 0 R" % kid for kid in kids) + b"] >>")
+
+        out = BytesIO()
+        out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(out.tell())
+            out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref = out.tell()
+        out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            out.write(b"%010d 00000 n \n" % offset)
+        out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+        return out.getvalue()
+
+
+@register("pdf", "PDF", "pdf", "application/pdf")
+def export_pdf(entry):
+    pdf = PDFRenderer()
+    for title, text in documents(entry):
+        pdf.new_page()
+        pdf.paragraph([(title, True)], size=HEADING_SIZES[0])
+        pdf.space(6)
+        for kind, level, runs in parse_markdown(text):
+            # Italic is not available in the base fonts used here, so it is set upright
+            pairs = [(run_text, bold) for run_text, bold, _ in runs]
+            if kind == "heading":
+                pdf.space(6)
+                pdf.paragraph([(run_text, True) for run_text, _ in pairs], size=HEADING_SIZES.get(level, 11.5))
+                pdf.space(2)
+            elif kind == "rule":
+                pdf.rule()
+            elif kind == "bullet":
+                pdf.paragraph(pairs, indent=14 * (level + 1), marker="•")
+            elif kind == "number":
+                pdf.paragraph(pairs[1:], indent=14 * (level + 1) + 6, marker=pairs[0][0].strip())
+            else:
+                pdf.paragraph(pairs)
+                pdf.space(3)
+    return pdf.render()
+
+
+def file_name(entry, fmt):
+    """Download name from the candidate, company and job title of an entry."""
+    parts = [entry.get("name"), entry.get("company"), entry.get("job_title")]
+    stem = "_".join(re.sub(r"[^\w-]+", "_", part).strip("_") for part in parts if part) or "documents"
+    return f"{stem[:80]}.{FORMATS[fmt].extension}"
+
+
+def export_entry(entry, fmt):
+    with timed("export", format=fmt):
+        return FORMATS[fmt].render(entry)
+
+
+def export_cached(entry, fmt, cache):
+    """export_entry() through `cache` (an LRUCache), keyed by entry id, format and EXPORT_VERSION."""
+    key = (entry["id"], fmt, EXPORT_VERSION)
+    data = cache.get(key)
+    if data is None:
+        data = export_entry(entry, fmt)
+        cache.set(key, data)
+    return data
+
+
+def write_history_zip(storage, fileobj, formats, page_size=50):
+    """
+    Write every history entry of `storage` into a ZIP archive on `fileobj`.
+
+    Entries are loaded a page of summaries at a time and exported one by one
+    (one file per entry and format), so memory use does not grow with the
+    history. Returns the number of entries written.
+    """
+    count = 0
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        offset = 0
+        while True:
+            summaries = storage.list_history(offset, page_size)
+            if not summaries:
+                break
+            for summary in summaries:
+                entry = storage.get_history(summary["id"])
+                if entry is None:
+                    continue
+                folder = f"{(entry.get('timestamp') or '').replace(':', '-').replace(' ', '_')}_{entry['id'][:8]}"
+                for fmt in formats:
+                    archive.writestr(f"{folder}/{file_name(entry, fmt)}", export_entry(entry, fmt))
+                count += 1
+            offset += len(summaries)
+    return count
@@ -0,0 +1,307 @@
+"""
+Text extraction for uploaded resumes and job descriptions.
+
+Parsers are registered per MIME type (and file extension, for browsers that
+report a generic type). Each parser imports its third-party library on first
+use, so sessions that only paste text or upload plain files never load
+PyPDF2, python-docx or odfpy.
+
+Parsers are generators that yield one page, paragraph or row at a time.
+`extract()` consumes them lazily and stops as soon as the page or character
+cap is reached, so a several-hundred-page PDF only costs as much as the part
+that fits in the prompt. Long PDFs can optionally be split across a process
+pool, since page text extraction is CPU-bound pure Python.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Bump when parser output changes so cached extractions are not reused
+PARSER_VERSION = 4
+
+# Caps applied by extract(); pages only limit paged formats (PDF)
+MAX_PAGES = int(os.environ.get("EXTRACT_MAX_PAGES", 50))
+MAX_CHARS = int(os.environ.get("EXTRACT_MAX_CHARS", 40000))
+
+# Process-pool PDF extraction: 0 or 1 workers keeps it serial, and documents
+# shorter than PARALLEL_MIN_PAGES are always extracted serially
+PDF_WORKERS = int(os.environ.get("EXTRACT_PDF_WORKERS", 0))
+PARALLEL_MIN_PAGES = int(os.environ.get("EXTRACT_PARALLEL_MIN_PAGES", 40))
+
+# Batch mode: job postings read from one CSV/JSON upload
+MAX_ROWS = int(os.environ.get("EXTRACT_MAX_ROWS", 1000))
+DESCRIPTION_COLUMNS = ("job_description", "description", "jd", "job description", "text")
+TITLE_COLUMNS = ("job_title", "title", "position", "role")
+COMPANY_COLUMNS = ("company", "company_name", "employer", "organization")
+
+# Yielded by paged parsers when the document has more pages than max_pages
+TRUNCATED = object()
+
+# MIME type / file extension -> parser(file) -> iterator of text segments;
+# paged parsers also accept max_pages
+PARSERS = {}
+PAGED_PARSERS = set()
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def register(*keys, paged=False):
+    """Register the decorated generator as the parser for the given MIME types and extensions."""
+    def decorator(func):
+        for key in keys:
+            PARSERS[key] = func
+        if paged:
+            PAGED_PARSERS.add(func)
+        return func
+    return decorator
+
+
+def get_parser(uploaded_file):
+    parser = PARSERS.get(getattr(uploaded_file, "type", None))
+    if parser is None:
+        extension = os.path.splitext(getattr(uploaded_file, "name", ""))[1].lower()
+        parser = PARSERS.get(extension, parse_plain_text)
+    return parser
+
+
+def extract(uploaded_file, max_pages=MAX_PAGES, max_chars=MAX_CHARS, workers=None):
+    """
+    Extract the text of an uploaded file within the given caps.
+
+    `workers` overrides PDF_WORKERS for paged formats. Returns (text, stats)
+    where stats holds "pages" (pages, paragraphs or rows read), "chars", "ms"
+    and "truncated" (True if a cap stopped extraction).
+    """
+    start = time.perf_counter()
+    parser = get_parser(uploaded_file)
+    if parser in PAGED_PARSERS:
+        segments = parser(uploaded_file, max_pages=max_pages, workers=workers)
+    else:
+        segments = parser(uploaded_file)
+
+    parts = []
+    pages = chars = 0
+    truncated = False
+    try:
+        for segment in segments:
+            if segment is TRUNCATED:
+                truncated = True
+                break
+            pages += 1
+            if not segment:
+                continue
+            if max_chars is not None and chars + len(segment) > max_chars:
+                segment = segment[:max_chars - chars]
+                truncated = True
+            parts.append(segment)
+            chars += len(segment)
+            if truncated:
+                break
+    finally:
+        segments.close()
+
+    stats = {"pages": pages, "chars": chars, "truncated": truncated,
+             "ms": (time.perf_counter() - start) * 1000}
+    return "\n".join(parts), stats
+
+
+def extract_text(uploaded_file, max_pages=MAX_PAGES, max_chars=MAX_CHARS, workers=None):
+    """Return only the text of an uploaded file; see extract()."""
+    return extract(uploaded_file, max_pages, max_chars, workers)[0]
+
+
+def extract_cached(uploaded_file, cache, max_pages=MAX_PAGES, max_chars=MAX_CHARS, workers=None):
+    """
+    extract() through `cache` (an LRUCache), keyed by the SHA-256 of the
+    uploaded bytes, the parser and its version, and the caps. Cached stats
+    carry "cached": True.
+    """
+    digest = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    key = (digest, get_parser(uploaded_file).__name__, PARSER_VERSION, max_pages, max_chars)
+    cached = cache.get(key)
+    if cached is not None:
+        text, stats = cached
+        return text, dict(stats, cached=True)
+
+    text, stats = extract(uploaded_file, max_pages, max_chars, workers)
+    cache.set(key, (text, stats))
+    return text, stats
+
+
+def _pick(record, columns):
+    lowered = {str(key).strip().lower(): value for key, value in record.items()}
+    for column in columns:
+        if lowered.get(column):
+            return str(lowered[column])
+    return ""
+
+
+def job_row(record):
+    """Normalize one CSV/JSON record to {"title", "company", "description"}."""
+    if isinstance(record, dict):
+        description = _pick(record, DESCRIPTION_COLUMNS) or str(next(iter(record.values()), ""))
+        return {"title": _pick(record, TITLE_COLUMNS), "company": _pick(record, COMPANY_COLUMNS),
+                "description": description}
+    return {"title": "", "company": "", "description": str(record)}
+
+
+def _csv_records(file):
+    file.seek(0)
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        text.detach()
+
+
+def _json_records(file):
+    data = json.load(file)
+    if isinstance(data, dict):
+        # Accept {"jobs": [...]}-style wrappers as well as a bare list
+        data = next((value for value in data.values() if isinstance(value, list)), [data])
+    yield from data
+
+
+def extract_rows(uploaded_file, max_rows=MAX_ROWS):
+    """
+    Read one job posting per CSV row or JSON array item for batch scoring.
+
+    Returns a list of {"title", "company", "description"} dicts, skipping rows
+    without a description and stopping after `max_rows`. The description comes
+    from the first of DESCRIPTION_COLUMNS present (else the first column).
+    """
+    parser = get_parser(uploaded_file)
+    records = _json_records(uploaded_file) if parser is parse_json else _csv_records(uploaded_file)
+    rows = []
+    try:
+        for record in records:
+            row = job_row(record)
+            if row["description"].strip():
+                rows.append(row)
+                if len(rows) >= max_rows:
+                    break
+    finally:
+        records.close()
+    return rows
+
+
+def get_pool(workers):
+    """Shared process pool, created on first use and grown if more workers are requested."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Forking the multi-threaded server can copy held locks into the child; start workers fresh
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _extract_pdf_pages(data, start, stop):
+    """Worker: text of pages [start, stop) of a PDF given as bytes."""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[index].extract_text() for index in range(start, stop)]
+
+
+def _parse_pdf_parallel(data, page_count, workers):
+    # Twice as many ranges as workers so an early stop wastes little work
+    size = max(1, math.ceil(page_count / (workers * 2)))
+    pool = get_pool(workers)
+    futures = [pool.submit(_extract_pdf_pages, data, start, min(start + size, page_count))
+               for start in range(0, page_count, size)]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+@register("text/plain", ".txt")
+def parse_plain_text(file):
+    yield file.getvalue().decode("utf-8")
+
+
+@register("application/json", ".json")
+def parse_json(file):
+    yield from json.dumps(json.load(file), indent=4).splitlines()
+
+
+@register("application/pdf", ".pdf", paged=True)
+def parse_pdf(file, max_pages=None, workers=None):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(file)
+    total = len(reader.pages)
+    page_count = total if max_pages is None else min(total, max_pages)
+    workers = PDF_WORKERS if workers is None else workers
+
+    if workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+        yield from _parse_pdf_parallel(file.getvalue(), page_count, workers)
+    else:
+        # Pages are parsed on access, so stopping early skips the rest of the file
+        for index in range(page_count):
+            yield reader.pages[index].extract_text()
+
+    if page_count < total:
+        yield TRUNCATED
+
+
+@register("application/vnd.openxmlformats-officedocument.wordprocessingml.document", ".docx")
+def parse_docx(file):
+    import docx
+    from docx.oxml.ns import qn
+    from docx.text.paragraph import Paragraph
+
+    doc = docx.Document(file)
+    for element in doc.element.body.iterchildren(qn("w:p")):
+        yield Paragraph(element, doc).text
+
+
+@register("application/vnd.oasis.opendocument.text", ".odt")
+def parse_odt(file):
+    from odf import teletype
+    from odf.namespaces import TEXTNS
+    from odf.opendocument import load
+
+    paragraphs = {(TEXTNS, "p"), (TEXTNS, "h")}
+
+    def walk(node):
+        for child in node.childNodes:
+            # Text nodes have no qname; their text is read through the paragraph holding them
+            qname = getattr(child, "qname", None)
+            if qname in paragraphs:
+                yield teletype.extractText(child)
+            elif qname is not None and child.childNodes:
+                yield from walk(child)
+
+    yield from walk(load(file).text)
+
+
+@register("text/csv", ".csv")
+def parse_csv(file):
+    # First column of each row, skipping the header
+    file.seek(0)
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        next(reader, None)
+        for row in reader:
+            if row:
+                yield row[0]
+    finally:
+        # Leave the upload open for later reruns
+        text.detach()
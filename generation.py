@@ -0,0 +1,406 @@
+"""
+Document generation helpers for the Gemini model.
+
+Prompts for the selected documents are sent in parallel so the wall-clock
+time of a generation batch is that of the slowest document rather than the
+sum of all of them. Output can be streamed chunk by chunk, and responses can
+be served from a `ResponseCache` so that identical requests cost nothing.
+
+Documents built from the same inputs share one context (see prompts.py).
+`share_context` sends it either as the common first part of every request
+or, once it is large enough for Gemini context caching, as a single
+`CachedContent` upload that every request then refers to.
+
+In combined mode all Create-page documents come back from a single request
+as JSON matching COMBINED_SCHEMA; `generate_combined` checks the response
+against the schema so callers can fall back to one request per document.
+
+`call_with_retries` retries rate-limited (429) and transient server errors
+with jittered exponential backoff; client.py applies it to every call.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from cache import LRUCache, ResponseCache
+from prompts import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+# Upper bound on in-flight requests per generation batch
+MAX_WORKERS = 3
+
+# Set to talk to another Gemini REST endpoint (e.g. benchmarks/fake_gemini_server.py)
+API_ENDPOINT = os.environ.get("GEMINI_API_ENDPOINT")
+
+# HTTP statuses worth retrying: rate limited, internal error, unavailable
+RETRY_STATUS = {429, 500, 503}
+
+# Contexts smaller than this are sent inline. Gemini rejects cached contents below the model's
+# minimum (4,096 tokens for gemini-2.0-flash), and contexts are capped at prompts.CONTEXT_TOKEN_BUDGET
+CONTEXT_CACHE_MIN_TOKENS = int(os.environ.get("CONTEXT_CACHE_MIN_TOKENS", 4096))
+CONTEXT_CACHE_TTL = int(os.environ.get("CONTEXT_CACHE_TTL", 3600))
+
+# Structured response of a combined request (Gemini response_schema subset)
+COMBINED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "resume_markdown": {"type": "string"},
+        "cover_letter_markdown": {"type": "string"},
+        "match_score": {"type": "integer"},
+        "missing_keywords": {"type": "array", "items": {"type": "string"}},
+        "strengths": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["resume_markdown", "cover_letter_markdown", "match_score", "missing_keywords", "strengths"],
+}
+COMBINED_CONFIG = {"response_mime_type": "application/json", "response_schema": COMBINED_SCHEMA}
+
+_configure_lock = threading.Lock()
+
+# Models bound to a cached context, reused until shortly before the upload expires
+_context_models = LRUCache(maxsize=16, ttl=max(60, CONTEXT_CACHE_TTL - 60))
+
+
+def get_model(api_key, model_name=DEFAULT_MODEL):
+    """Return a model bound to `api_key`; the SDK is imported on first use."""
+    import google.generativeai as genai
+    from google.generativeai import client as genai_client
+
+    with _configure_lock:
+        _configure(genai, api_key)
+        model = genai.GenerativeModel(model_name)
+        # The SDK configuration is global: pin this key's client before another key is configured
+        model._client = genai_client.get_default_generative_client()
+    return model
+
+
+def _configure(genai, api_key):
+    """Point the SDK's global configuration at `api_key`; hold _configure_lock."""
+    if API_ENDPOINT:
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": API_ENDPOINT})
+    else:
+        genai.configure(api_key=api_key)
+
+
+def error_status(error):
+    """HTTP status of an API error (google.api_core exceptions carry it as `code`), or None."""
+    try:
+        return int(getattr(error, "code", None))
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_retries(func, retries=5, base_delay=1.0, max_delay=60.0):
+    """
+    Return `func()`, retrying RETRY_STATUS errors up to `retries` times.
+
+    The n-th retry waits between half and all of base_delay * 2**n seconds
+    (capped at `max_delay`), so callers that failed together do not retry
+    together. Other errors, and the last failure, are raised.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries or error_status(e) not in RETRY_STATUS:
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+            logger.warning("Gemini call failed (%s), retry %d/%d in %.1fs", e, attempt + 1, retries, delay)
+            time.sleep(delay)
+
+
+class ContextModel:
+    """A model bound to cached content; `context_key` keeps response cache keys distinct per context."""
+
+    def __init__(self, model, context_key):
+        self.model = model
+        self.model_name = model.model_name
+        self.context_key = context_key
+
+    def generate_content(self, contents, **kwargs):
+        return self.model.generate_content(contents, **kwargs)
+
+
+def cached_context_model(model, context):
+    """
+    Upload `context` as Gemini cached content with the API key of `model` (a
+    client.GeminiClient) and return the client bound to it, so calls on the
+    context still share the key's quota, retries, breakers and fallback.
+    """
+    import google.generativeai as genai
+    from google.generativeai import caching
+    from google.generativeai import client as genai_client
+
+    # Only picking this key's clients needs the global configuration; the upload itself
+    # runs outside the lock so it does not hold up other sessions and batch workers
+    with _configure_lock:
+        _configure(genai, model.api_key)
+        cache_client = genai_client.get_default_cache_client()
+        generative_client = genai_client.get_default_generative_client()
+
+    # CachedContent.create() would look the cache client up again, so the request is sent through ours
+    request = caching.CachedContent._prepare_create_request(model=model.model_name, contents=[context],
+                                                            ttl=timedelta(seconds=CONTEXT_CACHE_TTL))
+    cached = caching.CachedContent._new_for_proto(cache_client.create_cached_content(request))
+    bound = genai.GenerativeModel.from_cached_content(cached)
+    bound._client = generative_client
+    return model.bind_context(context, bound)
+
+
+def share_context(model, context, instructions, min_tokens=CONTEXT_CACHE_MIN_TOKENS,
+                  cache_factory=cached_context_model, uses=None):
+    """
+    Combine one shared `context` with per-document `instructions` ({doc_type: text}).
+
+    Returns (model, prompts, stats). A context of at least `min_tokens` that
+    will be read by at least two requests (`uses`, by default one per
+    instruction; callers that reuse the context later pass more) is uploaded
+    once through `cache_factory(model, context)`, and the returned model is
+    bound to it, so each prompt is only its instructions. A context uploaded
+    earlier is reused for any number of requests. Other contexts (or a failed
+    upload) are sent as the first part of a multi-part request, giving every
+    document a byte-identical prefix. `stats` has
+    "mode" ("cached" or "prefix"), "shared_tokens" and "reused_tokens", the
+    context tokens not sent again because they were read from cached content.
+    A prefix is still sent and billed with every request (Gemini may bill it
+    at the implicit caching rate), so it reports no reused tokens.
+
+    Bound models are kept per API key, model and context, so a context
+    uploaded with one key is never used by another.
+    """
+    shared_tokens = estimate_tokens(context)
+    count = len(instructions)
+    cacheable = count and shared_tokens >= min_tokens
+    bound = None
+    if cacheable:
+        key = f"{getattr(model, 'api_key', '')}\0{model.model_name}\0{context}"
+        context_key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        bound = _context_models.get(context_key)
+    # An upload read only once costs a round-trip and storage and saves nothing
+    if cacheable and (bound is not None or (uses or count) >= 2):
+        try:
+            # A new upload sends the context once; an earlier one is read for free
+            reused = shared_tokens * count
+            if bound is None:
+                bound = ContextModel(cache_factory(model, context), context_key)
+                _context_models.set(context_key, bound)
+                reused -= shared_tokens
+            stats = {"mode": "cached", "shared_tokens": shared_tokens, "reused_tokens": reused}
+            return bound, dict(instructions), stats
+        except Exception as e:
+            logger.warning("Context caching failed, sending the context inline: %s", e)
+
+    prompts = {doc_type: [context, text] for doc_type, text in instructions.items()}
+    return model, prompts, {"mode": "prefix", "shared_tokens": shared_tokens, "reused_tokens": 0}
+
+
+def _cache_key(model, prompt, generation_config):
+    context_key = getattr(model, "context_key", None)
+    if context_key is not None:
+        prompt = [context_key, prompt]
+    return ResponseCache.make_key(getattr(model, "model_name", ""), prompt, generation_config)
+
+
+def generate_text(model, prompt, cache=None, bypass_cache=False, generation_config=None, rate_limiter=None):
+    """
+    Return the model's text for `prompt`, consulting `cache` first.
+
+    With `bypass_cache` the model is always called, and the fresh response
+    replaces whatever was cached for the same request. `rate_limiter` (a
+    client.TokenBucket) is only consulted for calls that reach the model.
+    """
+    key = None
+    if cache is not None:
+        key = _cache_key(model, prompt, generation_config)
+        if not bypass_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    if generation_config is None:
+        text = model.generate_content(prompt).text
+    else:
+        text = model.generate_content(prompt, generation_config=generation_config).text
+
+    if cache is not None:
+        cache.set(key, text)
+    return text
+
+
+def generate_documents(model, prompts, max_workers=MAX_WORKERS, cache=None, bypass_cache=False, rate_limiter=None):
+    """
+    Generate every prompt in `prompts` ({doc_type: prompt}) concurrently.
+
+    Yields (doc_type, text, error) tuples in completion order, so callers can
+    render each document as soon as it lands. A failing document yields its
+    exception instead of raising, leaving the other documents intact.
+    """
+    if not prompts:
+        return
+
+    workers = max(1, min(max_workers, len(prompts)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(generate_text, model, prompt, cache, bypass_cache, None, rate_limiter): doc_type
+                   for doc_type, prompt in prompts.items()}
+        for future in as_completed(futures):
+            doc_type = futures[future]
+            try:
+                yield doc_type, future.result(), None
+            except Exception as e:
+                yield doc_type, None, e
+
+
+def stream_text(model, prompt, cache=None, bypass_cache=False, generation_config=None, timings=None):
+    """
+    Yield the model's text for `prompt` chunk by chunk.
+
+    A cache hit is yielded as a single chunk; a completed stream is written
+    back to the cache. If `timings` is a dict it receives "ttft" (seconds to
+    the first chunk) and "total" (seconds to the end of the stream).
+    """
+    start = time.perf_counter()
+    key = None
+    if cache is not None:
+        key = _cache_key(model, prompt, generation_config)
+        cached = None if bypass_cache else cache.get(key)
+        if cached is not None:
+            if timings is not None:
+                timings["ttft"] = timings["total"] = time.perf_counter() - start
+                timings["cached"] = True
+            yield cached
+            return
+
+    kwargs = {"stream": True}
+    if generation_config is not None:
+        kwargs["generation_config"] = generation_config
+
+    parts = []
+    for chunk in model.generate_content(prompt, **kwargs):
+        try:
+            text = chunk.text
+        except ValueError:
+            # Chunks without text parts (e.g. the final finish-reason chunk)
+            continue
+        if not parts and timings is not None:
+            timings["ttft"] = time.perf_counter() - start
+        parts.append(text)
+        yield text
+
+    if timings is not None:
+        timings["total"] = time.perf_counter() - start
+        timings.setdefault("ttft", timings["total"])
+        timings["cached"] = False
+    if cache is not None:
+        cache.set(key, "".join(parts))
+
+
+def stream_documents(model, prompts, max_workers=MAX_WORKERS, cache=None, bypass_cache=False):
+    """
+    Stream every prompt in `prompts` ({doc_type: prompt}) concurrently.
+
+    Yields (doc_type, event, payload) tuples as they happen, where event is
+    "chunk" (payload: the new text), "done" (payload: timings dict) or
+    "error" (payload: the exception). Only the calling thread receives
+    events, so it is safe to update Streamlit elements from the loop.
+    """
+    if not prompts:
+        return
+
+    events = queue.Queue()
+
+    def worker(doc_type, prompt):
+        timings = {}
+        try:
+            for text in stream_text(model, prompt, cache, bypass_cache, timings=timings):
+                events.put((doc_type, "chunk", text))
+            events.put((doc_type, "done", timings))
+        except Exception as e:
+            events.put((doc_type, "error", e))
+
+    workers = max(1, min(max_workers, len(prompts)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for doc_type, prompt in prompts.items():
+            pool.submit(worker, doc_type, prompt)
+
+        pending = len(prompts)
+        while pending:
+            event = events.get()
+            if event[1] != "chunk":
+                pending -= 1
+            yield event
+
+
+def parse_combined(text):
+    """Parse a combined response and check it against COMBINED_SCHEMA; raises ValueError."""
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+
+    report = {}
+    for field in COMBINED_SCHEMA["required"]:
+        if field not in data:
+            raise ValueError(f"missing field {field!r}")
+        value = data[field]
+        kind = COMBINED_SCHEMA["properties"][field]["type"]
+        if kind == "string":
+            valid = isinstance(value, str) and value.strip()
+        elif kind == "integer":
+            valid = isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 100
+        else:
+            valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+        if not valid:
+            raise ValueError(f"invalid value for {field!r}")
+        report[field] = value
+    return report
+
+
+def generate_combined(model, prompt, cache=None, bypass_cache=False, timings=None):
+    """
+    Generate every Create-page document with one structured request.
+
+    Returns the report dict checked by `parse_combined`, which raises
+    ValueError on a malformed response. Only valid responses are cached.
+    `timings` is filled like in `stream_text`.
+    """
+    start = time.perf_counter()
+    key = None
+    text = None
+    if cache is not None:
+        key = _cache_key(model, prompt, COMBINED_CONFIG)
+        text = None if bypass_cache else cache.get(key)
+    cached = text is not None
+    if not cached:
+        text = generate_text(model, prompt, generation_config=COMBINED_CONFIG)
+
+    report = parse_combined(text)
+    if cache is not None and not cached:
+        cache.set(key, text)
+    if timings is not None:
+        timings["ttft"] = timings["total"] = time.perf_counter() - start
+        timings["cached"] = cached
+    return report
+
+
+def combined_documents(report):
+    """Split a combined report into the per-document texts ({doc_type: markdown})."""
+    analysis = [f"**Model match estimate:** {report['match_score']}%", "", "**Strengths**"]
+    analysis += [f"- {item}" for item in report["strengths"]] or ["- none"]
+    analysis += ["", "**Missing keywords**"]
+    analysis += [f"- {item}" for item in report["missing_keywords"]] or ["- none"]
+    return {
+        "resume": report["resume_markdown"],
+        "cover_letter": report["cover_letter_markdown"],
+        "ats_analysis": "\n".join(analysis),
+    }
@@ -0,0 +1,129 @@
+"""
+Stage timings, token counts and cache hits.
+
+Code under measurement wraps a stage in `timed(stage)` or reports an
+already measured duration with `observe(stage, ms)`. Every observation goes
+to the process-wide `PROCESS` recorder and to the recorder of the current
+session (set by `use_recorder` at the start of each rerun), and is logged
+as one JSON line on the "metrics" logger:
+
+    {"event": "timing", "stage": "llm.resume", "ms": 1834.2, "cached": false, "prompt_tokens": 1210, ...}
+
+Fields named in COUNTERS (token counts) are summed into counters, and a
+"cached" field counts a cache hit or miss. Recorders keep the last
+MAX_SAMPLES durations of each stage for p50/p95 and can render themselves
+in the OpenMetrics text format.
+"""
+
+import json
+import logging
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger("metrics")
+
+MAX_SAMPLES = 500
+
+# Observation fields summed into counters of the same name
+COUNTERS = ("prompt_tokens", "response_tokens")
+
+_session = ContextVar("metrics_recorder", default=None)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+class Recorder:
+    """Bounded per-stage duration samples (ms) and counters, safe to update from any thread."""
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.max_samples = max_samples
+        self._samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._totals = defaultdict(lambda: [0, 0.0])  # stage -> [count, total ms], never truncated
+        self._counters = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def observe(self, stage, ms):
+        with self._lock:
+            self._samples[stage].append(ms)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += ms
+
+    def count(self, name, value=1):
+        with self._lock:
+            self._counters[name] += value
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def summary(self):
+        """One row per stage: "stage", "count", "p50_ms", "p95_ms" (of recent samples) and "total_ms"."""
+        with self._lock:
+            stages = {stage: (list(samples), tuple(self._totals[stage])) for stage, samples in self._samples.items()}
+        return [{"stage": stage, "count": count, "p50_ms": round(statistics.median(samples), 1),
+                 "p95_ms": round(percentile(samples, 0.95), 1), "total_ms": round(total, 1)}
+                for stage, (samples, (count, total)) in sorted(stages.items())]
+
+    def openmetrics(self, prefix="resume"):
+        lines = [f"# TYPE {prefix}_stage_seconds summary"]
+        for row in self.summary():
+            label = f'stage="{row["stage"]}"'
+            lines.append(f'{prefix}_stage_seconds{{{label},quantile="0.5"}} {row["p50_ms"] / 1000:.4f}')
+            lines.append(f'{prefix}_stage_seconds{{{label},quantile="0.95"}} {row["p95_ms"] / 1000:.4f}')
+            lines.append(f"{prefix}_stage_seconds_count{{{label}}} {row['count']}")
+            lines.append(f"{prefix}_stage_seconds_sum{{{label}}} {row['total_ms'] / 1000:.4f}")
+        for name, value in sorted(self.counters().items()):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._counters.clear()
+
+
+PROCESS = Recorder()
+
+
+def use_recorder(recorder):
+    """Make `recorder` receive this thread's observations (besides PROCESS)."""
+    _session.set(recorder)
+
+
+def _recorders():
+    session = _session.get()
+    return (PROCESS,) if session is None else (PROCESS, session)
+
+
+def observe(stage, ms, **fields):
+    """Record a stage duration in milliseconds, with optional token counts and "cached"."""
+    for recorder in _recorders():
+        recorder.observe(stage, ms)
+        for name in COUNTERS:
+            if fields.get(name):
+                recorder.count(name, fields[name])
+        if "cached" in fields:
+            recorder.count("cache_hits" if fields["cached"] else "cache_misses")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"event": "timing", "stage": stage, "ms": round(ms, 2), **fields}, default=str))
+
+
+@contextmanager
+def timed(stage, **fields):
+    """Time the body as `stage`; the yielded dict can be filled with more fields before it ends."""
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        observe(stage, (time.perf_counter() - start) * 1000, **fields)
@@ -0,0 +1,303 @@
+"""
+Prompt assembly with a per-document token budget.
+
+Every prompt sent to Gemini is built here. When a prompt is over budget, its
+free-text fields (experience, job description, extracted resume text, ...)
+are first stripped of lines repeated across the candidate's fields or across
+the job's fields, never of job lines the candidate repeats. If the prompt is
+still over budget, the longest fields are shortened by keeping their most
+relevant sentences, and the first one that does not fit is cut at a word
+boundary to fill what is left. A job description keeps the sentences that mention the candidate's
+keywords, and candidate text keeps the sentences that mention the job's
+keywords.
+
+Documents generated from the same inputs share one context (the profile and
+job for the Create page, the resume and job for the ATS Optimizer). The
+context is built once and each document only adds its short instructions, so
+the same prefix can be sent, or cached, for the whole batch.
+
+Tokens are estimated locally (about four characters per token), which is
+close enough for budgeting and costs no API call. Each build logs its token
+count and the bytes saved.
+"""
+
+import logging
+import os
+import re
+
+from ats_scorer import extract_terms, is_skill
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", 6000))
+CHARS_PER_TOKEN = 4
+
+# Lines shorter than this are never treated as duplicates (bullets, headings)
+MIN_DUPLICATE_CHARS = 25
+
+# Fields describing the job rather than the candidate; lines are deduplicated within each side only
+JOB_FIELDS = ("job_description", "company_research", "job_desc")
+
+# Leftover budget worth filling with the start of a sentence that did not fit whole
+MIN_TRUNCATED_TOKENS = 20
+
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9•\-*])|\n+")
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def prompt_tokens(prompt):
+    """Estimated tokens of a prompt given as text or as a list of parts."""
+    parts = prompt if isinstance(prompt, list) else [prompt]
+    return sum(estimate_tokens(str(part)) for part in parts)
+
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in SENTENCE_RE.split(text) if sentence and sentence.strip()]
+
+
+def dedupe_fields(fields, names):
+    """Drop lines of the named fields that already appeared in an earlier one."""
+    seen = set()
+    deduped = dict(fields)
+    for name in names:
+        kept = []
+        for line in str(fields.get(name) or "").splitlines():
+            key = " ".join(line.lower().split())
+            if len(key) >= MIN_DUPLICATE_CHARS:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(line)
+        deduped[name] = "\n".join(kept)
+    return deduped
+
+
+def compress(text, max_tokens, keywords):
+    """Keep the sentences of `text` most relevant to `keywords`, in their original order."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    sentences = split_sentences(text)
+
+    def relevance(index):
+        terms = extract_terms(sentences[index])
+        hits = sum(2 if is_skill(term) else 1 for term in terms if term in keywords)
+        return (-hits, index)
+
+    kept, used, skipped = {}, 0, []
+    for index in sorted(range(len(sentences)), key=relevance):
+        cost = estimate_tokens(sentences[index]) + 1
+        if used + cost > max_tokens:
+            skipped.append(index)
+            continue
+        kept[index] = sentences[index]
+        used += cost
+    # Fill what is left with the most relevant sentence that did not fit, cut short, so a
+    # field without sentence breaks (or with only long sentences) is never emptied
+    left = max_tokens - used
+    if skipped and (not kept or left >= MIN_TRUNCATED_TOKENS):
+        kept[skipped[0]] = truncate(sentences[skipped[0]], left - 1)
+    return "\n".join(kept[index] for index in sorted(kept) if kept[index])
+
+
+def truncate(text, max_tokens):
+    """Cut `text` at a word boundary to at most `max_tokens`, marking the cut with an ellipsis."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max(0, max_tokens * CHARS_PER_TOKEN - 1)
+    cut = text[:limit]
+    if " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    cut = cut.rstrip(" ,;:-")
+    return cut + "…" if cut else ""
+
+
+def allocate(sizes, available):
+    """Share `available` tokens among fields so short fields stay whole (water-filling)."""
+    allocation = {}
+    remaining = dict(sizes)
+    while remaining:
+        share = max(0, available) // len(remaining)
+        fitting = {name: size for name, size in remaining.items() if size <= share}
+        if not fitting:
+            allocation.update({name: share for name in remaining})
+            break
+        for name, size in fitting.items():
+            allocation[name] = size
+            available -= size
+            del remaining[name]
+    return allocation
+
+
+def assemble(name, template, fields, compressible, keywords, budget=PROMPT_TOKEN_BUDGET):
+    """
+    Render `template(fields)` within `budget` tokens.
+
+    `compressible` lists the fields that may be deduplicated and shortened,
+    both only when the prompt is over budget; `keywords` maps each of them to
+    the terms its sentences are ranked by.
+    Returns (prompt, stats) with "tokens", "original_tokens" and "bytes_saved".
+    """
+    original = template(fields)
+    fields = dict(fields)
+
+    overhead = estimate_tokens(template({**fields, **{field: "" for field in compressible}}))
+    sizes = {field: estimate_tokens(fields[field]) for field in compressible}
+    if overhead + sum(sizes.values()) > budget:
+        # Repeats are only dropped within one side: a job line the candidate also wrote is a met
+        # requirement the model needs to see, so it is never removed from the job fields
+        fields = dedupe_fields(fields, [field for field in compressible if field not in JOB_FIELDS])
+        fields = dedupe_fields(fields, [field for field in compressible if field in JOB_FIELDS])
+        sizes = {field: estimate_tokens(fields[field]) for field in compressible}
+    if overhead + sum(sizes.values()) > budget:
+        allocation = allocate(sizes, budget - overhead)
+        for field in compressible:
+            if sizes[field] > allocation[field]:
+                fields[field] = compress(fields[field], allocation[field], keywords.get(field, set()))
+
+    prompt = template(fields)
+    stats = {
+        "tokens": estimate_tokens(prompt),
+        "original_tokens": estimate_tokens(original),
+        "bytes_saved": len(original.encode("utf-8")) - len(prompt.encode("utf-8")),
+    }
+    logger.info("%s prompt: %d tokens (was %d), %d bytes saved",
+                name, stats["tokens"], stats["original_tokens"], stats["bytes_saved"])
+    return prompt, stats
+
+
+def profile_text(profile):
+    return "\n".join(str(profile.get(field) or "") for field in
+                     ("headline", "objective", "experience", "skills", "education", "certifications"))
+
+
+def _keywords(text):
+    return set(extract_terms(text))
+
+
+PROFILE_FIELDS = ("objective", "experience", "skills", "education", "certifications")
+
+# Every field of a saved profile, as entered on the Create page
+PROFILE_KEYS = ("name", "email", "phone", "linkedin", "portfolio", "location", "headline") + PROFILE_FIELDS
+
+# Documents of the Create page, in display order
+DOC_TYPES = ("resume", "cover_letter", "ats_analysis")
+
+# Tokens left over in the budget for the document-specific instructions
+INSTRUCTION_TOKENS = 500
+CONTEXT_TOKEN_BUDGET = PROMPT_TOKEN_BUDGET - INSTRUCTION_TOKENS
+
+
+def build_profile_context(profile, job, budget=CONTEXT_TOKEN_BUDGET):
+    """
+    Candidate profile and target job, shared by every document of the Create page.
+
+    The document-specific instructions (resume_instructions, ...) are sent
+    after this context, so it is built and budgeted once per batch.
+    """
+    def template(f):
+        return (f"CANDIDATE PROFILE\n"
+                f"Name: {f['name']}\nHeadline: {f['headline']}\nEmail: {f['email']}\nPhone: {f['phone']}\n"
+                f"Location: {f['location']}\nLinkedIn: {f['linkedin']}\nPortfolio: {f['portfolio']}\n"
+                f"Objective: {f['objective']}\nExperience: {f['experience']}\nSkills: {f['skills']}\n"
+                f"Education: {f['education']}\nCertifications: {f['certifications']}\n\n"
+                f"TARGET JOB: {f['job_title']} at {f['company']}\n"
+                f"JOB DESCRIPTION:\n{f['job_description']}\n\n"
+                f"COMPANY RESEARCH:\n{f['company_research']}")
+
+    fields = {**{key: str(value or "") for key, value in profile.items()},
+              **{key: str(value or "") for key, value in job.items()}}
+    fields.setdefault("company_research", "")
+    profile_keywords = _keywords(profile_text(profile))
+    job_keywords = _keywords(fields.get("job_description", ""))
+    compressible = PROFILE_FIELDS + ("job_description", "company_research")
+    keywords = {field: job_keywords for field in PROFILE_FIELDS}
+    keywords["job_description"] = keywords["company_research"] = profile_keywords
+    return assemble("profile_context", template, fields, compressible, keywords, budget)
+
+
+def resume_instructions(resume_format):
+    return (f"Using the candidate profile above, generate a professional {resume_format} resume "
+            f"optimized for the job description. Format in Markdown with clear sections and bullet points.")
+
+
+def cover_letter_instructions(tone):
+    return (f"Using the candidate profile above, write a {tone.lower()} tone cover letter applying for the "
+            f"target job. Draw on the candidate's experience, skills and education, tailor it to the job "
+            f"description and use the company research where it helps.")
+
+
+def ats_analysis_instructions(ats_score):
+    return (f"A keyword scan found a {ats_score['score']}% match between the candidate profile and the job "
+            f"description above. Missing keywords: {', '.join(ats_score['missing']) or 'none'}.\n\n"
+            f"Provide: 1) Specific suggestions to improve ATS compatibility, focusing on the missing keywords, "
+            f"2) Profile strengths")
+
+
+def document_instructions(doc_types, resume_format, tone, ats_score):
+    """Instructions for each requested document ({doc_type: text}), in DOC_TYPES order."""
+    builders = {
+        "resume": lambda: resume_instructions(resume_format),
+        "cover_letter": lambda: cover_letter_instructions(tone),
+        "ats_analysis": lambda: ats_analysis_instructions(ats_score),
+    }
+    return {doc_type: builders[doc_type]() for doc_type in DOC_TYPES if doc_type in doc_types}
+
+
+def combined_instructions(resume_format, tone, ats_score):
+    """Instructions for one structured request returning every Create-page document (see COMBINED_SCHEMA)."""
+    return (f"Using the candidate profile above, return one JSON object with these fields:\n"
+            f"- resume_markdown: a professional {resume_format} resume optimized for the job description, "
+            f"in Markdown with clear sections and bullet points\n"
+            f"- cover_letter_markdown: a {tone.lower()} tone cover letter applying for the target job, tailored "
+            f"to the job description and the company research, in Markdown\n"
+            f"- match_score: an integer from 0 to 100 rating how well the profile fits the job "
+            f"(a keyword scan found {ats_score['score']}%)\n"
+            f"- missing_keywords: important job keywords the profile lacks "
+            f"(the keyword scan found: {', '.join(ats_score['missing']) or 'none'})\n"
+            f"- strengths: the profile's main strengths for this job, one per item")
+
+
+def _build_resume_job_prompt(name, template, resume_text, job_desc, budget):
+    fields = {"resume_text": resume_text, "job_desc": job_desc}
+    keywords = {"resume_text": _keywords(job_desc), "job_desc": _keywords(resume_text)}
+    return assemble(name, template, fields, ("resume_text", "job_desc"), keywords, budget)
+
+
+def build_resume_job_context(resume_text, job_desc, budget=CONTEXT_TOKEN_BUDGET):
+    """Resume and job description, shared by the ATS analysis and the optimized rewrite."""
+    def template(f):
+        return f"RESUME:\n{f['resume_text']}\n\nJOB DESCRIPTION:\n{f['job_desc']}"
+
+    return _build_resume_job_prompt("resume_job_context", template, resume_text, job_desc, budget)
+
+
+def ats_instructions(ats_score):
+    return (f"Perform a detailed ATS compatibility analysis of the resume above against the job description.\n\n"
+            f"A keyword scan scored this resume at {ats_score['score']}%.\n"
+            f"Matched keywords: {', '.join(ats_score['matched'][:15]) or 'none'}\n"
+            f"Missing keywords: {', '.join(ats_score['missing']) or 'none'}\n\n"
+            f"Provide:\n"
+            f"1. Recommendations to improve, focusing on the missing keywords\n"
+            f"2. Current resume strengths\n"
+            f"3. Suggested modifications with examples\n")
+
+
+def optimize_instructions():
+    return ("Based on the resume and job description above, generate a fully optimized resume for ATS "
+            "compatibility. Keep the same basic information but rephrase and enhance to maximize keyword "
+            "matching. Format in Markdown.")
+
+
+def build_batch_prompt(resume_text, job_desc, score, missing_keywords, budget=PROMPT_TOKEN_BUDGET):
+    def template(f):
+        return (f"A keyword scan scored this resume at {score}% against the job below.\n"
+                f"Missing keywords: {missing_keywords or 'none'}\n\n"
+                f"RESUME:\n{f['resume_text']}\n\n"
+                f"JOB DESCRIPTION:\n{f['job_desc']}\n\n"
+                f"In at most five bullet points, assess the fit and the most "
+                f"valuable changes to the resume for this job.")
+
+    return _build_resume_job_prompt("batch", template, resume_text, job_desc, budget)
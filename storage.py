@@ -0,0 +1,331 @@
+"""
+Storage for saved profiles and generation history.
+
+Two interchangeable backends share the same methods:
+
+- `MemoryStorage` keeps everything in process memory, optionally capping the
+  number of history entries. It is the default, one instance per session.
+- `SQLiteStorage` persists to a SQLite file in WAL mode, so readers never
+  block the writer, with indexes on timestamp, company and job title. One
+  file can be shared by many users: every row has an owner, every method
+  takes `owner` and only sees that owner's rows, and `OwnerStorage` binds
+  one owner so it can be used like a MemoryStorage.
+
+History is read a page at a time: `list_history` returns entry summaries
+(no documents) and `get_history` loads one full entry, so callers never
+hold the whole history in memory. Both backends keep a full-text index of
+each entry's job title, company and documents (an inverted index in memory,
+FTS5 in SQLite); `query` matches entries containing every query word as a
+word prefix.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+
+SUMMARY_FIELDS = ("id", "timestamp", "job_title", "company")
+WORD_RE = re.compile(r"\w+")
+
+# History rows matching a full-text query; as a subquery it runs once, not once per history row
+MATCHING_ROWIDS = "rowid IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)"
+
+
+def summarize(entry):
+    return {field: entry.get(field) for field in SUMMARY_FIELDS}
+
+
+def searchable_text(entry):
+    """Text indexed for search: job title, company and every generated document."""
+    documents = (entry.get("results") or {}).values()
+    return "\n".join([entry.get("job_title") or "", entry.get("company") or "", *documents])
+
+
+def query_words(query):
+    return WORD_RE.findall((query or "").lower())
+
+
+class MemoryStorage:
+    """In-process storage; `max_history` drops the oldest entries beyond that many."""
+
+    def __init__(self, max_history=None):
+        self.max_history = max_history
+        self._profiles = {}
+        self._history = OrderedDict()
+        self._index = {}  # word -> ids of the entries containing it
+        self._words = {}  # id -> words of that entry, to unindex it on delete
+        self._lock = threading.Lock()
+
+    def list_profiles(self):
+        with self._lock:
+            return sorted(self._profiles)
+
+    def get_profile(self, name):
+        with self._lock:
+            profile = self._profiles.get(name)
+            return dict(profile) if profile is not None else None
+
+    def save_profile(self, name, profile):
+        with self._lock:
+            self._profiles[name] = dict(profile)
+
+    def delete_profile(self, name):
+        with self._lock:
+            self._profiles.pop(name, None)
+
+    def add_history(self, entry):
+        self.add_history_many([entry])
+
+    def add_history_many(self, entries):
+        with self._lock:
+            for entry in entries:
+                self._unindex(entry["id"])
+                self._history[entry["id"]] = entry
+                self._history.move_to_end(entry["id"])
+                words = set(query_words(searchable_text(entry)))
+                self._words[entry["id"]] = words
+                for word in words:
+                    self._index.setdefault(word, set()).add(entry["id"])
+            while self.max_history and len(self._history) > self.max_history:
+                entry_id, _ = self._history.popitem(last=False)
+                self._unindex(entry_id)
+
+    def _unindex(self, entry_id):
+        for word in self._words.pop(entry_id, ()):
+            ids = self._index[word]
+            ids.discard(entry_id)
+            if not ids:
+                del self._index[word]
+
+    def _matches(self, query):
+        """Ids of the entries matching every word of `query` (as a prefix), or None for no query."""
+        words = query_words(query)
+        if not words:
+            return None
+        matches = None
+        for word in words:
+            ids = set()
+            for indexed, postings in self._index.items():
+                if indexed.startswith(word):
+                    ids |= postings
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                break
+        return matches
+
+    def _entries(self, query):
+        matches = self._matches(query)
+        entries = reversed(self._history.values())
+        if matches is None:
+            return entries
+        return (entry for entry in entries if entry["id"] in matches)
+
+    def count_history(self, query=None):
+        with self._lock:
+            matches = self._matches(query)
+            return len(self._history) if matches is None else len(matches)
+
+    def list_history(self, offset=0, limit=20, query=None):
+        """Summaries of `limit` matching entries, newest first, skipping the newest `offset`."""
+        with self._lock:
+            return [summarize(entry) for entry in islice(self._entries(query), offset, offset + limit)]
+
+    def get_history(self, entry_id):
+        with self._lock:
+            return self._history.get(entry_id)
+
+    def delete_history(self, entry_id):
+        with self._lock:
+            self._history.pop(entry_id, None)
+            self._unindex(entry_id)
+
+
+class SQLiteStorage:
+    """
+    SQLite-backed storage, safe to share between sessions and threads.
+
+    Rows stored before storage had owners are given `legacy_owner`.
+    """
+
+    def __init__(self, path, legacy_owner=""):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._migrate(legacy_owner)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS profiles "
+            "(owner TEXT NOT NULL, name TEXT NOT NULL, data TEXT NOT NULL, updated REAL NOT NULL, "
+            "PRIMARY KEY (owner, name))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS history (id TEXT PRIMARY KEY, timestamp TEXT NOT NULL, job_title TEXT, "
+            "company TEXT, data TEXT NOT NULL, owner TEXT NOT NULL DEFAULT '')"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS history_owner_timestamp ON history (owner, timestamp)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS history_owner_company ON history (owner, company)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS history_owner_job_title ON history (owner, job_title)")
+        has_index = self._db.execute("SELECT 1 FROM sqlite_master WHERE name = 'history_fts'").fetchone()
+        # Full-text index; each row shares the rowid of its history row
+        self._db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(text)")
+        if not has_index:
+            # Index entries stored before search existed
+            rows = self._db.execute("SELECT rowid, data FROM history").fetchall()
+            self._db.executemany("INSERT INTO history_fts (rowid, text) VALUES (?, ?)",
+                                 [(rowid, searchable_text(json.loads(data))) for rowid, data in rows])
+        self._db.commit()
+
+    def _columns(self, table):
+        return {row[1] for row in self._db.execute(f"PRAGMA table_info({table})")}
+
+    def _migrate(self, legacy_owner):
+        """Add owners to tables created before they existed."""
+        columns = self._columns("profiles")
+        if columns and "owner" not in columns:
+            # The primary key changes to (owner, name), so the table is rebuilt
+            self._db.execute("ALTER TABLE profiles RENAME TO profiles_unowned")
+            self._db.execute(
+                "CREATE TABLE profiles (owner TEXT NOT NULL, name TEXT NOT NULL, data TEXT NOT NULL, "
+                "updated REAL NOT NULL, PRIMARY KEY (owner, name))"
+            )
+            self._db.execute("INSERT INTO profiles SELECT ?, name, data, updated FROM profiles_unowned",
+                             (legacy_owner,))
+            self._db.execute("DROP TABLE profiles_unowned")
+        columns = self._columns("history")
+        if columns and "owner" not in columns:
+            self._db.execute("ALTER TABLE history ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+            self._db.execute("UPDATE history SET owner = ?", (legacy_owner,))
+            for name in ("history_timestamp", "history_company", "history_job_title"):
+                self._db.execute(f"DROP INDEX IF EXISTS {name}")
+        self._db.commit()
+
+    def list_profiles(self, owner=""):
+        with self._lock:
+            return [name for (name,) in self._db.execute("SELECT name FROM profiles WHERE owner = ? ORDER BY name",
+                                                         (owner,))]
+
+    def get_profile(self, name, owner=""):
+        with self._lock:
+            row = self._db.execute("SELECT data FROM profiles WHERE owner = ? AND name = ?", (owner, name)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_profile(self, name, profile, owner=""):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?)",
+                             (owner, name, json.dumps(profile), time.time()))
+            self._db.commit()
+
+    def delete_profile(self, name, owner=""):
+        with self._lock:
+            self._db.execute("DELETE FROM profiles WHERE owner = ? AND name = ?", (owner, name))
+            self._db.commit()
+
+    def add_history(self, entry, owner=""):
+        self.add_history_many([entry], owner)
+
+    def add_history_many(self, entries, owner=""):
+        """Insert many entries in one transaction."""
+        rows = [(entry["id"], entry["timestamp"], entry.get("job_title"), entry.get("company"),
+                 json.dumps(entry, default=str), owner) for entry in entries]
+        index_rows = [(entry["id"], searchable_text(entry)) for entry in entries]
+        with self._lock:
+            # Upsert keeps the rowid of a replaced entry, and with it its index row; an id
+            # already stored for another owner is left alone
+            self._db.executemany(
+                "INSERT INTO history (id, timestamp, job_title, company, data, owner) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET timestamp = excluded.timestamp, job_title = excluded.job_title, "
+                "company = excluded.company, data = excluded.data WHERE owner = excluded.owner",
+                rows,
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO history_fts (rowid, text) "
+                "SELECT rowid, ? FROM history WHERE id = ? AND owner = ?",
+                [(text, entry_id, owner) for entry_id, text in index_rows],
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _match_expression(query):
+        # Every word as a quoted prefix term, so user input is never parsed as FTS syntax
+        return " AND ".join(f'"{word}"*' for word in query_words(query))
+
+    def count_history(self, query=None, owner=""):
+        expression = self._match_expression(query)
+        with self._lock:
+            if not expression:
+                return self._db.execute("SELECT COUNT(*) FROM history WHERE owner = ?", (owner,)).fetchone()[0]
+            return self._db.execute(f"SELECT COUNT(*) FROM history WHERE owner = ? AND {MATCHING_ROWIDS}",
+                                    (owner, expression)).fetchone()[0]
+
+    def list_history(self, offset=0, limit=20, query=None, owner=""):
+        """Summaries of `limit` matching entries, newest first, skipping the newest `offset`."""
+        expression = self._match_expression(query)
+        with self._lock:
+            if not expression:
+                rows = self._db.execute(
+                    "SELECT id, timestamp, job_title, company FROM history WHERE owner = ? "
+                    "ORDER BY timestamp DESC, rowid DESC LIMIT ? OFFSET ?",
+                    (owner, limit, offset),
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    f"SELECT id, timestamp, job_title, company FROM history WHERE owner = ? AND {MATCHING_ROWIDS} "
+                    "ORDER BY timestamp DESC, rowid DESC LIMIT ? OFFSET ?",
+                    (owner, expression, limit, offset),
+                ).fetchall()
+        return [dict(zip(SUMMARY_FIELDS, row)) for row in rows]
+
+    def get_history(self, entry_id, owner=""):
+        with self._lock:
+            row = self._db.execute("SELECT data FROM history WHERE id = ? AND owner = ?", (entry_id, owner)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete_history(self, entry_id, owner=""):
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM history_fts WHERE rowid = (SELECT rowid FROM history WHERE id = ? AND owner = ?)",
+                (entry_id, owner),
+            )
+            self._db.execute("DELETE FROM history WHERE id = ? AND owner = ?", (entry_id, owner))
+            self._db.commit()
+
+
+class OwnerStorage:
+    """The profiles and history of one owner of a shared SQLiteStorage, with the methods of MemoryStorage."""
+
+    def __init__(self, storage, owner):
+        self.storage = storage
+        self.owner = owner
+
+    def list_profiles(self):
+        return self.storage.list_profiles(owner=self.owner)
+
+    def get_profile(self, name):
+        return self.storage.get_profile(name, owner=self.owner)
+
+    def save_profile(self, name, profile):
+        self.storage.save_profile(name, profile, owner=self.owner)
+
+    def delete_profile(self, name):
+        self.storage.delete_profile(name, owner=self.owner)
+
+    def add_history(self, entry):
+        self.storage.add_history(entry, owner=self.owner)
+
+    def add_history_many(self, entries):
+        self.storage.add_history_many(entries, owner=self.owner)
+
+    def count_history(self, query=None):
+        return self.storage.count_history(query, owner=self.owner)
+
+    def list_history(self, offset=0, limit=20, query=None):
+        return self.storage.list_history(offset, limit, query, owner=self.owner)
+
+    def get_history(self, entry_id):
+        return self.storage.get_history(entry_id, owner=self.owner)
+
+    def delete_history(self, entry_id):
+        self.storage.delete_history(entry_id, owner=self.owner)
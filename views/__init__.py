@@ -0,0 +1,7 @@
+"""
+Page modules for the app.
+
+Each module exposes `render(api_key, bypass_cache)` and is imported by
+`app.py` only when its page is selected in the sidebar, so a rerun only
+builds the widgets (and loads the dependencies) of the visible page.
+"""
@@ -0,0 +1,263 @@
+"""
+ATS Optimizer Module for Resume Analysis and Optimization
+
+This page allows users to analyze the compatibility of their resumes with
+a job description based on ATS (Applicant Tracking System) standards.
+
+Features:
+- Text input for resume and job description.
+- File upload for resume (TXT/PDF/DOCX/ODT/JSON) and job description (CSV/TXT/JSON).
+- ATS compatibility analysis using AI.
+- Match score visualization.
+- Optimized resume generation with keyword enhancements.
+- Batch mode: rank one resume against many job descriptions (one per CSV/JSON row).
+"""
+
+import csv
+import io
+
+import streamlit as st
+
+from ats_scorer import match_label, score_many, score_resume
+from client import TokenBucket
+from extractors import extract_cached, extract_rows
+from generation import generate_documents, share_context, stream_text
+from metrics import timed
+from prompts import (ats_instructions, build_batch_prompt, build_resume_job_context, estimate_tokens,
+                     optimize_instructions, prompt_tokens)
+from views.common import (error_message, format_context, format_extraction, format_timings, get_client,
+                          get_parse_cache, get_response_cache, observe_generation, render_error, stream_markdown)
+
+
+def render(api_key, bypass_cache):
+    response_cache = get_response_cache()
+    parse_cache = get_parse_cache()
+
+    st.title("🎯 ATS Optimizer")
+
+    mode = st.radio("Mode:", ["Single job description", "Batch: one job per CSV/JSON row"], horizontal=True)
+    batch_mode = mode.startswith("Batch")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 📄 Your Resume")
+        resume_text = st.text_area("Paste your current resume text:", height=300)
+        uploaded_resume = st.file_uploader("Or upload your resume (TXT, PDF, DOCX, ODT, JSON):", type=["txt", "pdf", "docx", "odt", "json"])
+
+    with col2:
+        if batch_mode:
+            st.markdown("### 📋 Job Descriptions")
+            uploaded_jobs = st.file_uploader("Upload job descriptions, one per row (CSV, JSON):", type=["csv", "json"])
+            top_k = st.number_input("AI analysis for the top matches:", min_value=0, max_value=50, value=5)
+            requests_per_minute = st.number_input("Max AI requests per minute:", min_value=1, max_value=600, value=30)
+        else:
+            st.markdown("### 📋 Job Description")
+            job_desc = st.text_area("Paste the job description:", height=300)
+            uploaded_csv = st.file_uploader("Or upload a job description file (CSV, TXT, JSON):", type=["csv", "txt", "json"])
+
+    if batch_mode:
+        render_batch(api_key, bypass_cache, resume_text, uploaded_resume, uploaded_jobs, top_k, requests_per_minute)
+    else:
+        render_single(api_key, bypass_cache, resume_text, uploaded_resume, job_desc, uploaded_csv)
+
+    with st.expander("🐞 Debug"):
+        parse_stats = parse_cache.stats()
+        response_stats = response_cache.stats()
+        st.markdown(f"**Parse cache:** {parse_stats['hits']} hits / {parse_stats['misses']} misses "
+                    f"({parse_stats['size']}/{parse_stats['maxsize']} entries)")
+        st.markdown(f"**Response cache:** {response_stats['hits']} hits / {response_stats['misses']} misses")
+
+
+def render_single(api_key, bypass_cache, resume_text, uploaded_resume, job_desc, uploaded_csv):
+    """Analyze the resume against one job description and offer an optimized rewrite."""
+    response_cache = get_response_cache()
+    parse_cache = get_parse_cache()
+
+    if st.button("🔍 Analyze ATS Compatibility") and api_key:
+        # Check inputs, extract text from uploads, then stream the AI analysis
+        if not resume_text and not uploaded_resume:
+            st.warning("Please provide either a resume text or upload a resume file.")
+        elif not job_desc and not uploaded_csv:
+            st.warning("Please provide either a job description or upload a file.")
+        else:
+            try:
+                # Extract text from uploaded files, reusing earlier extractions of the same bytes
+                if uploaded_resume:
+                    resume_text = extract_upload(uploaded_resume, parse_cache)
+                if uploaded_csv:
+                    job_desc = extract_upload(uploaded_csv, parse_cache)
+
+                # Resume + job context shared by the analysis and the optimized rewrite; kept
+                # so the optimized resume can be generated on a later rerun
+                with timed("prompt_build") as fields:
+                    context, context_stats = build_resume_job_context(resume_text, job_desc)
+                    fields["context_tokens"] = context_stats["tokens"]
+                st.session_state.ats_inputs = {"resume_text": resume_text, "job_desc": job_desc, "context": context}
+
+                # Shared, rate-limited client for this API key
+                model = get_client(api_key)
+
+                # Local keyword score, shown before the model is called
+                ats_score = score_resume(resume_text, job_desc)
+                st.session_state.ats_score = ats_score
+                render_match_score(ats_score)
+
+                # ATS analysis instructions; the score comes from the local scan. The optimized
+                # rewrite reads the same context, so it is worth caching for both
+                model, prompts, context_stats = share_context(model, context, {"ats": ats_instructions(ats_score)},
+                                                              uses=2)
+
+                st.markdown("### 📊 Detailed Analysis")
+                analysis_timings = {}
+                analysis = stream_markdown(st.empty(), stream_text(model, prompts["ats"], cache=response_cache,
+                                                                   bypass_cache=bypass_cache, timings=analysis_timings))
+                observe_generation("ats", analysis_timings, prompts["ats"], analysis)
+                st.caption(format_timings(analysis_timings) + " · " + format_context(context_stats))
+                st.session_state.ats_analysis = analysis
+
+            except Exception as e:
+                render_error(e)
+
+    elif "ats_analysis" in st.session_state:
+        # Show the last analysis again on reruns (e.g. the optimize click below)
+        render_match_score(st.session_state.ats_score)
+        st.markdown("### 📊 Detailed Analysis")
+        st.markdown(st.session_state.ats_analysis)
+
+    # Generate optimized resume if requested
+    if "ats_inputs" in st.session_state and st.button("✨ Generate Optimized Resume") and api_key:
+        # Rephrase the resume for keyword matching, reusing the context of the analysis
+        context = st.session_state.ats_inputs["context"]
+
+        try:
+            model = get_client(api_key)
+            model, prompts, context_stats = share_context(model, context, {"optimize": optimize_instructions()})
+            st.markdown("### ✅ Optimized Resume")
+            optimize_timings = {}
+            optimized_resume = stream_markdown(st.empty(), stream_text(model, prompts["optimize"], cache=response_cache,
+                                                                       bypass_cache=bypass_cache, timings=optimize_timings))
+            observe_generation("optimize", optimize_timings, prompts["optimize"], optimized_resume)
+            st.caption(format_timings(optimize_timings) + " · " + format_context(context_stats))
+
+            # Provide a download option
+            st.download_button(
+                label="Download Optimized Resume",
+                data=optimized_resume,
+                file_name="optimized_resume.md",
+                mime="text/markdown"
+            )
+        except Exception as e:
+            render_error(e)
+
+
+def render_batch(api_key, bypass_cache, resume_text, uploaded_resume, uploaded_jobs, top_k, requests_per_minute):
+    """Rank many job descriptions locally, then ask the AI about the top matches only."""
+    response_cache = get_response_cache()
+    parse_cache = get_parse_cache()
+
+    if st.button("📊 Rank Job Descriptions"):
+        if not resume_text and not uploaded_resume:
+            st.warning("Please provide either a resume text or upload a resume file.")
+        elif not uploaded_jobs:
+            st.warning("Please upload a CSV or JSON file with one job description per row.")
+        elif top_k and not api_key:
+            st.warning("⚠️ Please enter a valid Google Gemini API Key, or set the AI analysis count to 0.")
+        else:
+            try:
+                if uploaded_resume:
+                    resume_text = extract_upload(uploaded_resume, parse_cache)
+
+                with timed("extract_rows") as fields:
+                    jobs = extract_rows(uploaded_jobs)
+                    fields["rows"] = len(jobs)
+                scores = score_many(resume_text, [job["description"] for job in jobs])
+                ranked = sorted(zip(jobs, scores), key=lambda pair: -pair[1]["score"])
+                st.caption(f"Scored {len(jobs)} job descriptions locally in {sum(s['ms'] for s in scores):.0f} ms")
+
+                rows = [{
+                    "rank": rank,
+                    "score": score["score"],
+                    "title": job["title"],
+                    "company": job["company"],
+                    "missing_keywords": ", ".join(score["missing"]),
+                    "ai_analysis": "",
+                    "description": job["description"],
+                } for rank, (job, score) in enumerate(ranked, start=1)]
+
+                # AI analysis for the top matches only, with bounded concurrency and a request rate cap
+                top_rows = rows[:top_k]
+                if top_rows:
+                    with timed("prompt_build", prompts=len(top_rows)):
+                        prompts = {row["rank"]: build_batch_prompt(resume_text, row["description"], row["score"],
+                                                                   row["missing_keywords"])[0]
+                                   for row in top_rows}
+                    model = get_client(api_key)
+                    # This run's own cap; the shared client also holds every session to the key's quota
+                    limiter = TokenBucket(requests_per_minute)
+                    progress = st.progress(0.0, text="Analyzing top matches...")
+                    with timed("llm.batch", prompts=len(prompts)) as fields:
+                        for done, (rank, text, error) in enumerate(generate_documents(
+                                model, prompts, cache=response_cache, bypass_cache=bypass_cache, rate_limiter=limiter), start=1):
+                            rows[rank - 1]["ai_analysis"] = error_message(error) if error is not None else text
+                            progress.progress(done / len(prompts), text=f"Analyzed {done}/{len(prompts)} top matches")
+                        fields["prompt_tokens"] = sum(prompt_tokens(prompt) for prompt in prompts.values())
+                        fields["response_tokens"] = sum(estimate_tokens(rows[rank - 1]["ai_analysis"]) for rank in prompts)
+
+                st.session_state.ats_batch = rows
+            except Exception as e:
+                render_error(e)
+
+    rows = st.session_state.get("ats_batch")
+    if rows:
+        st.markdown("### 🏆 Ranked Matches")
+        st.dataframe([{key: row[key] for key in ("rank", "score", "title", "company", "missing_keywords")} for row in rows],
+                     hide_index=True, use_container_width=True)
+        st.download_button(
+            label="Download Ranked Matches (CSV)",
+            data=rows_to_csv(rows),
+            file_name="ranked_matches.csv",
+            mime="text/csv"
+        )
+
+        for row in rows:
+            if row["ai_analysis"]:
+                with st.expander(f"#{row['rank']} · {row['score']}% · {row['title'] or 'Untitled'} {('at ' + row['company']) if row['company'] else ''}"):
+                    st.markdown(row["ai_analysis"])
+
+
+def extract_upload(uploaded_file, parse_cache):
+    """Extract an upload through the parse cache, showing and recording its stats."""
+    with timed("extract") as fields:
+        text, stats = extract_cached(uploaded_file, parse_cache)
+        fields.update(chars=stats["chars"], from_parse_cache=bool(stats.get("cached")))
+    st.caption(format_extraction(uploaded_file.name, stats))
+    return text
+
+
+def rows_to_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def render_match_score(ats_score):
+    """Show a progress bar, coloured feedback and missing keywords for a local ATS score."""
+    match_value = ats_score["score"]
+    st.markdown("### Match Score")
+    st.progress(match_value/100)
+
+    # Display feedback based on match score
+    css_class, _ = match_label(match_value)
+    if css_class == "high-match":
+        st.markdown(f'<div style="padding: 10px; background-color: #2ecc71; color: white; border-radius: 5px;">Score: {match_value}% - Strong Match</div>', unsafe_allow_html=True)
+    elif css_class == "medium-match":
+        st.markdown(f'<div style="padding: 10px; background-color: #f1c40f; color: black; border-radius: 5px;">Score: {match_value}% - Good Match</div>', unsafe_allow_html=True)
+    else:
+        st.markdown(f'<div style="padding: 10px; background-color: #e74c3c; color: white; border-radius: 5px;">Score: {match_value}% - Needs Improvement</div>', unsafe_allow_html=True)
+
+    if ats_score["missing"]:
+        st.markdown("**Missing keywords:** " + ", ".join(f"`{term}`" for term in ats_score["missing"]))
+    st.caption(f"Scored locally in {ats_score['ms']:.1f} ms")
@@ -0,0 +1,211 @@
+"""Helpers shared by several pages."""
+
+import os
+import uuid
+
+import streamlit as st
+
+from ats_scorer import match_label
+from cache import LRUCache, ResponseCache
+from client import CircuitOpenError, GeminiClient
+from exporters import FORMATS, export_cached, file_name
+from generation import error_status
+from metrics import PROCESS, Recorder, observe
+from prompts import estimate_tokens, prompt_tokens
+from storage import MemoryStorage, OwnerStorage, SQLiteStorage
+
+
+@st.cache_resource
+def get_response_cache():
+    """Process-wide Gemini response cache; set RESPONSE_CACHE_PATH to persist it to SQLite."""
+    return ResponseCache(
+        maxsize=int(os.environ.get("RESPONSE_CACHE_SIZE", 256)),
+        ttl=int(os.environ.get("RESPONSE_CACHE_TTL", 24 * 60 * 60)),
+        path=os.environ.get("RESPONSE_CACHE_PATH"),
+    )
+
+
+@st.cache_resource
+def get_client(api_key):
+    """Gemini client shared by every session using `api_key`: one quota, retry policy and set of circuit breakers."""
+    return GeminiClient(api_key)
+
+
+@st.cache_resource
+def get_parse_cache():
+    """Process-wide cache of extracted upload text, keyed by content hash."""
+    return LRUCache(maxsize=int(os.environ.get("PARSE_CACHE_SIZE", 32)))
+
+
+@st.cache_resource
+def get_export_cache():
+    """Process-wide cache of exported files, keyed by history entry id and format."""
+    return LRUCache(maxsize=int(os.environ.get("EXPORT_CACHE_SIZE", 64)))
+
+
+@st.cache_resource
+def _shared_storage(path):
+    # Rows saved before storage had owners belong to STORAGE_OWNER's single-user deployment
+    return SQLiteStorage(path, legacy_owner=os.environ.get("STORAGE_OWNER", ""))
+
+
+def current_owner():
+    """
+    Whose profiles and history this session sees: the signed-in user when
+    Streamlit authentication is configured, else STORAGE_OWNER (a single-user
+    deployment), else a random id private to this browser session.
+    """
+    user = getattr(st, "user", None)
+    if user is not None and getattr(user, "is_logged_in", False):
+        return f"user:{user.get('email') or user.get('sub')}"
+    owner = os.environ.get("STORAGE_OWNER")
+    if owner is not None:
+        return owner
+    if "owner" not in st.session_state:
+        st.session_state.owner = f"session:{uuid.uuid4().hex}"
+    return st.session_state.owner
+
+
+def get_storage():
+    """
+    Profiles and history. With STORAGE_PATH set, the rows of current_owner()
+    in a SQLite file shared by every session of this deployment; otherwise
+    memory private to the session, capped at HISTORY_MAX_ENTRIES entries.
+    """
+    path = os.environ.get("STORAGE_PATH")
+    if path:
+        return OwnerStorage(_shared_storage(path), current_owner())
+    if "storage" not in st.session_state:
+        st.session_state.storage = MemoryStorage(max_history=int(os.environ.get("HISTORY_MAX_ENTRIES", 100)))
+    return st.session_state.storage
+
+
+def get_recorder():
+    """Stage timings and counters of this session, shown in the Performance panel."""
+    if "metrics" not in st.session_state:
+        st.session_state.metrics = Recorder()
+    return st.session_state.metrics
+
+
+DOC_TITLES = {
+    "resume": "✅ Generated Resume",
+    "cover_letter": "✅ Generated Cover Letter",
+    "ats_analysis": "🔍 ATS Analysis",
+}
+
+
+def render_match_box(ats_score):
+    """Show the local keyword match score and the top missing keywords."""
+    css_class, label = match_label(ats_score["score"])
+    st.markdown(f'<div class="feedback-box {css_class}">Match: {ats_score["score"]}% - {label}</div>', unsafe_allow_html=True)
+    if ats_score["missing"]:
+        st.markdown("**Missing keywords:** " + ", ".join(f"`{term}`" for term in ats_score["missing"]))
+
+
+def render_document(doc_type, text, ats_score=None):
+    """Display a generated document, with the match box above ATS analyses."""
+    st.markdown(f"### {DOC_TITLES[doc_type]}")
+
+    if doc_type == "ats_analysis" and ats_score is not None:
+        render_match_box(ats_score)
+
+    st.markdown(text)
+
+
+def render_downloads(entry, key_prefix):
+    """One download button per export format; each file is rendered once per entry and then served from cache."""
+    cache = get_export_cache()
+    columns = st.columns(len(FORMATS))
+    for column, (fmt, export) in zip(columns, FORMATS.items()):
+        try:
+            data = export_cached(entry, fmt, cache)
+        except ImportError as e:
+            column.caption(f"{export.label}: needs {e.name}")
+            continue
+        column.download_button(export.label, data=data, file_name=file_name(entry, fmt), mime=export.mime,
+                               key=f"{key_prefix}_{fmt}_{entry['id']}")
+
+
+def stream_markdown(placeholder, chunks):
+    """Render streamed text into `placeholder` as it arrives and return the full text."""
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        placeholder.markdown(text + " ▌")
+    placeholder.markdown(text)
+    return text
+
+
+def error_message(error):
+    """Why a generation failed, with specific advice for rate limits and open circuits."""
+    if isinstance(error, CircuitOpenError):
+        return f"Gemini is failing repeatedly, so requests are paused. Please try again in {error.retry_in:.0f}s."
+    if error_status(error) == 429:
+        return "The Gemini quota for this API key is used up. Please wait a minute and try again."
+    return f"Error: {error}"
+
+
+def render_error(error):
+    st.error(f"❌ {error_message(error)}")
+
+
+def observe_generation(name, timings, prompt, text):
+    """Record one model call (or cache hit) as the "llm.<name>" stage."""
+    observe(f"llm.{name}", timings["total"] * 1000, ttft_ms=round(timings["ttft"] * 1000, 1),
+            cached=timings["cached"], prompt_tokens=prompt_tokens(prompt), response_tokens=estimate_tokens(text))
+
+
+def format_timings(timings):
+    source = "cache" if timings.get("cached") else "model"
+    return f"⏱️ First token {timings['ttft']:.2f}s · Total {timings['total']:.2f}s ({source})"
+
+
+def format_extraction(file_name, stats):
+    note = " (truncated to fit the prompt)" if stats["truncated"] else ""
+    if stats.get("cached"):
+        note += " · from cache"
+    return f"📄 {file_name}: {stats['pages']} pages/sections · {stats['chars']:,} chars in {stats['ms']:.0f} ms{note}"
+
+
+def format_context(stats):
+    if stats["mode"] == "cached":
+        return (f"♻️ Shared context: {stats['shared_tokens']:,} tokens cached once · "
+                f"{stats['reused_tokens']:,} tokens not resent")
+    return (f"♻️ Shared context: {stats['shared_tokens']:,} tokens sent as the common prefix of each request "
+            f"(eligible for Gemini's implicit caching)")
+
+
+def render_performance(api_key):
+    """Per-stage p50/p95 of this session, token and cache counters, and the process-wide OpenMetrics text."""
+    recorder = get_recorder()
+    st.markdown("---")
+    st.markdown("## 📈 Performance")
+
+    rows = recorder.summary()
+    if rows:
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+    else:
+        st.info("No timings recorded in this session yet.")
+
+    counters = recorder.counters()
+    calls = counters.get("cache_hits", 0) + counters.get("cache_misses", 0)
+    hit_rate = f"{counters.get('cache_hits', 0) / calls:.0%}" if calls else "n/a"
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Prompt tokens", f"{counters.get('prompt_tokens', 0):,}")
+    col2.metric("Response tokens", f"{counters.get('response_tokens', 0):,}")
+    col3.metric("Response cache hit rate", hit_rate)
+
+    if api_key:
+        client_stats = get_client(api_key).stats()
+        st.caption(f"Gemini client (shared by every session on this key): {client_stats['calls']} calls · "
+                   f"{client_stats['attempts']} attempts · {client_stats['fallbacks']} fallbacks · "
+                   f"{client_stats['failures']} failures · open circuits: {', '.join(client_stats['open_circuits']) or 'none'}")
+
+    if st.button("Reset session timings"):
+        recorder.clear()
+        st.rerun()
+
+    with st.expander("OpenMetrics (all sessions)"):
+        text = PROCESS.openmetrics()
+        st.code(text, language="text")
+        st.download_button("Download metrics", data=text, file_name="metrics.txt", mime="text/plain")
@@ -0,0 +1,226 @@
+"""Create Resume & Cover Letter page."""
+
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from ats_scorer import score_resume
+from generation import combined_documents, generate_combined, share_context, stream_documents
+from metrics import timed
+from prompts import build_profile_context, combined_instructions, document_instructions, profile_text
+from views.common import (DOC_TITLES, error_message, format_context, format_timings, get_client, get_response_cache,
+                          get_storage, observe_generation, render_document, render_downloads, render_error)
+
+# Multiselect label -> document type
+GENERATE_OPTIONS = {"Resume": "resume", "Cover Letter": "cover_letter", "ATS Analysis": "ats_analysis"}
+
+
+def render(api_key, bypass_cache):
+    response_cache = get_response_cache()
+
+    st.title("📄 AI Resume & Cover Letter Generator")
+
+    # Create tabs for different sections
+    tab1, tab2, tab3 = st.tabs(["Personal Info", "Job Details", "Generate & Export"])
+
+    with tab1:
+        st.markdown("## 📝 Personal Information")
+
+        # Two-column layout for personal info
+        col1, col2 = st.columns(2)
+        with col1:
+            name = st.text_input("👤 Full Name:", key="name")
+            email = st.text_input("✉️ Email:", key="email")
+            phone = st.text_input("📞 Phone:", key="phone")
+            linkedin = st.text_input("🔗 LinkedIn:", key="linkedin")
+
+        with col2:
+            location = st.text_input("📍 Location:", key="location")
+            headline = st.text_input("💫 Professional Headline:", key="headline")
+            portfolio = st.text_input("🌐 Portfolio (Optional):", key="portfolio")
+            objective = st.text_area("🎯 Career Objective:", key="objective", height=100)
+
+        st.markdown("## 💼 Professional Experience")
+        experience = st.text_area("Describe your work experience:", key="experience", height=150)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("## 🛠️ Skills")
+            skills = st.text_area("List your skills:", key="skills", height=100)
+
+        with col2:
+            st.markdown("## 🎓 Education")
+            education = st.text_area("Education Details:", key="education", height=100)
+            certifications = st.text_area("Certifications (Optional):", key="certifications", height=100)
+
+        # Save profile option
+        profile_name = st.text_input("Profile Name:", key="profile_name")
+        if st.button("Save Profile") and profile_name:
+            profile_data = {
+                "name": name, "email": email, "phone": phone, "linkedin": linkedin,
+                "portfolio": portfolio, "location": location, "headline": headline,
+                "objective": objective, "experience": experience, "skills": skills,
+                "education": education, "certifications": certifications
+            }
+            get_storage().save_profile(profile_name, profile_data)
+            st.success(f"Profile '{profile_name}' saved!")
+
+    with tab2:
+        st.markdown("## 🏢 Job Details")
+
+        job_title = st.text_input("🔍 Job Title:", key="job_title")
+        company = st.text_input("🏢 Company Name:", key="company")
+
+        st.markdown("### 📋 Job Description")
+        job_description = st.text_area("Paste the job description:", key="job_description", height=250)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            resume_format = st.selectbox("Resume Format:",
+                               ["Chronological", "Functional", "Combination", "Targeted"], key="resume_format")
+
+        with col2:
+            tone = st.selectbox("Cover Letter Tone:",
+                          options=["Formal", "Professional", "Balanced", "Conversational"],
+                          index=1, key="tone")
+
+        st.markdown("### 📚 Additional Information (Optional)")
+        company_research = st.text_area("Company Research:", key="company_research", height=100)
+
+        uploaded_resume = st.file_uploader("Upload current resume (Optional):", type=['txt', 'pdf', 'docx'])
+
+    with tab3:
+        st.markdown("## 🚀 Generate Your Documents")
+
+        generate_options = st.multiselect("Select what to generate:",
+                                    list(GENERATE_OPTIONS),
+                                    default=["Resume", "Cover Letter"])
+        combined_mode = st.checkbox("⚡ Combined mode: one request returns every document as structured JSON",
+                                    key="combined_mode")
+
+        if st.button("🚀 Generate Documents"):
+            if not api_key:
+                st.warning("⚠️ Please enter a valid Google Gemini API Key.")
+            elif not name or not experience or not skills or not job_description:
+                st.warning("⚠️ Please fill in all required fields.")
+            else:
+                try:
+                    # Shared, rate-limited client for this API key
+                    model = get_client(api_key)
+
+                    # Build the shared profile + job context once, within the token budget
+                    profile = {
+                        "name": name, "email": email, "phone": phone, "linkedin": linkedin,
+                        "portfolio": portfolio, "location": location, "headline": headline,
+                        "objective": objective, "experience": experience, "skills": skills,
+                        "education": education, "certifications": certifications
+                    }
+                    job = {"job_title": job_title, "company": company,
+                           "job_description": job_description, "company_research": company_research}
+                    with timed("prompt_build") as fields:
+                        context, context_stats = build_profile_context(profile, job)
+                        fields["context_tokens"] = context_stats["tokens"]
+
+                    # Local keyword score; the LLM only writes the narrative around it
+                    ats_score = score_resume(profile_text(profile), job_description)
+
+                    doc_types = [GENERATE_OPTIONS[option] for option in generate_options]
+                    instructions = document_instructions(doc_types, resume_format, tone, ats_score)
+
+                    results, timings, report = {}, {}, None
+                    if combined_mode and instructions:
+                        results, timings, report = generate_combined_documents(
+                            model, context, combined_instructions(resume_format, tone, ats_score),
+                            list(instructions), ats_score, response_cache, bypass_cache)
+                    if report is None:
+                        results, timings = stream_into_slots(model, context, instructions, ats_score,
+                                                             response_cache, bypass_cache)
+
+                    # Save to history
+                    history_entry = {
+                        "id": str(uuid.uuid4()),
+                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "name": name,
+                        "job_title": job_title,
+                        "company": company,
+                        "results": results,
+                        "timings": timings,
+                        "ats_score": ats_score if "ats_analysis" in instructions else None,
+                        "report": report
+                    }
+                    get_storage().add_history(history_entry)
+                    st.session_state.current_id = history_entry["id"]
+
+                except Exception as e:
+                    render_error(e)
+
+        # Outside the button branch, so the downloads survive the rerun each click triggers
+        entry = get_storage().get_history(st.session_state.current_id) if "current_id" in st.session_state else None
+        if entry and entry["results"]:
+            st.markdown("### 📥 Export Options")
+            render_downloads(entry, "export")
+
+
+def generate_combined_documents(model, context, instructions, doc_types, ats_score, response_cache, bypass_cache):
+    """
+    Generate every document with one structured request and show the selected ones.
+
+    Returns (results, timings, report); report is None when the response
+    does not match the schema, so the caller can fall back to streaming.
+    """
+    model, prompts, context_stats = share_context(model, context, {"combined": instructions})
+    combined_timings = {}
+    try:
+        with st.spinner("Generating all documents in one request..."):
+            report = generate_combined(model, prompts["combined"], cache=response_cache,
+                                       bypass_cache=bypass_cache, timings=combined_timings)
+    except ValueError as e:
+        st.warning(f"⚠️ Combined response was not valid ({e}); generating each document separately.")
+        return {}, {}, None
+
+    observe_generation("combined", combined_timings, prompts["combined"],
+                       report["resume_markdown"] + report["cover_letter_markdown"])
+    documents = combined_documents(report)
+    results = {doc_type: documents[doc_type] for doc_type in doc_types}
+    for doc_type, text in results.items():
+        render_document(doc_type, text, ats_score)
+    st.caption(format_timings(combined_timings) + " · 1 request · " + format_context(context_stats))
+    return results, {doc_type: combined_timings for doc_type in results}, report
+
+
+def stream_into_slots(model, context, instructions, ats_score, response_cache, bypass_cache):
+    """Stream one request per document concurrently; returns (results, timings)."""
+    # Each document only adds its instructions to the shared context
+    model, prompts, context_stats = share_context(model, context, instructions)
+    st.caption(format_context(context_stats))
+
+    # Reserve a slot per document so results keep their order as they arrive
+    slots = {doc_type: st.empty() for doc_type in prompts}
+    for doc_type, slot in slots.items():
+        if doc_type == "ats_analysis":
+            # The score is ready before any model output
+            with slot.container():
+                render_document(doc_type, "🔄 Writing suggestions...", ats_score)
+        else:
+            slot.info("🔄 Generating...")
+
+    # Stream responses concurrently, updating each slot token by token
+    results = {}
+    timings = {}
+    partial = {doc_type: "" for doc_type in prompts}
+    for doc_type, event, payload in stream_documents(model, prompts, cache=response_cache, bypass_cache=bypass_cache):
+        if event == "chunk":
+            partial[doc_type] += payload
+            with slots[doc_type].container():
+                render_document(doc_type, partial[doc_type] + " ▌", ats_score)
+        elif event == "error":
+            slots[doc_type].error(f"❌ {DOC_TITLES[doc_type]} failed. {error_message(payload)}")
+        else:
+            results[doc_type] = partial[doc_type]
+            timings[doc_type] = payload
+            observe_generation(doc_type, payload, prompts[doc_type], results[doc_type])
+            with timed("render", doc=doc_type), slots[doc_type].container():
+                render_document(doc_type, results[doc_type], ats_score)
+                st.caption(format_timings(payload))
+    return results, timings
@@ -0,0 +1,91 @@
+"""Generation History page."""
+
+import tempfile
+
+import streamlit as st
+
+from exporters import FORMATS, write_history_zip
+from metrics import timed
+from views.common import get_storage, render_downloads
+
+# Entries loaded from storage per page
+PAGE_SIZE = 10
+
+
+def render(api_key, bypass_cache):
+    storage = get_storage()
+    st.title("📜 Generation History")
+
+    query = st.text_input("🔎 Search by company, title or keyword:")
+
+    with timed("history_query", searched=bool(query)):
+        total = storage.count_history(query)
+    if not total:
+        st.info("No history entries match your search." if query else "No generation history available.")
+    else:
+        # Only the current page of summaries is loaded, most recent first; a new search starts at page 1
+        pages = -(-total // PAGE_SIZE)
+        page = 1
+        if pages > 1:
+            page = st.number_input("Page:", min_value=1, max_value=pages, value=1, key=f"history_page_{query}")
+        st.caption(f"{total} entries · page {page} of {pages}")
+
+        for summary in storage.list_history((page - 1) * PAGE_SIZE, PAGE_SIZE, query):
+            with st.expander(f"{summary['timestamp']} - {summary['job_title']} at {summary['company']}"):
+                # Documents are loaded and rendered only for entries the user opens
+                if st.toggle("Show documents", key=f"show_{summary['id']}"):
+                    with timed("render.history"):
+                        render_entry(storage.get_history(summary["id"]))
+
+                if st.button("Delete Entry", key=f"del_{summary['id']}"):
+                    storage.delete_history(summary["id"])
+                    st.success("History entry deleted!")
+                    st.rerun()
+
+        render_zip_export(storage)
+
+
+def render_zip_export(storage):
+    """Build one ZIP of the whole history, written entry by entry into a temporary file."""
+    with st.expander("📦 Export all history"):
+        formats = st.multiselect("Formats:", list(FORMATS), default=["md", "pdf"],
+                                 format_func=lambda fmt: FORMATS[fmt].label, key="zip_formats")
+        if st.button("Build ZIP", disabled=not formats):
+            with tempfile.TemporaryFile() as f, st.spinner("Exporting history..."):
+                with timed("export.zip", formats=len(formats)) as fields:
+                    fields["entries"] = write_history_zip(storage, f, formats)
+                f.seek(0)
+                data = f.read()
+            st.download_button("Download history.zip", data=data, file_name="history.zip", mime="application/zip")
+
+
+def render_entry(item):
+    """Tabs with the documents of one history entry."""
+    if item is None:
+        st.info("This entry was deleted.")
+        return
+
+    results = item["results"]
+
+    if results:
+        doc_tabs = st.tabs(["Resume", "Cover Letter", "ATS Analysis"])
+
+        with doc_tabs[0]:
+            if "resume" in results:
+                st.markdown(results["resume"])
+            else:
+                st.info("No resume was generated.")
+
+        with doc_tabs[1]:
+            if "cover_letter" in results:
+                st.markdown(results["cover_letter"])
+            else:
+                st.info("No cover letter was generated.")
+
+        with doc_tabs[2]:
+            if "ats_analysis" in results:
+                st.markdown(results["ats_analysis"])
+            else:
+                st.info("No ATS analysis was generated.")
+
+        render_downloads(item, "history")
@@ -0,0 +1,60 @@
+"""Profile Manager page."""
+
+import streamlit as st
+
+from views.common import get_storage
+
+
+def render(api_key, bypass_cache):
+    storage = get_storage()
+    st.title("👤 Profile Manager")
+
+    profile_names = storage.list_profiles()
+    if not profile_names:
+        st.info("No saved profiles yet. Create one in the Resume & Cover Letter tab.")
+    else:
+        profile_to_view = st.selectbox("Select profile to edit:", profile_names)
+
+        if profile_to_view:
+            profile_data = storage.get_profile(profile_to_view)
+            st.markdown(f"## Profile: {profile_to_view}")
+
+            edited_profile = {}
+            col1, col2 = st.columns(2)
+
+            with col1:
+                edited_profile["name"] = st.text_input("Full Name:", value=profile_data.get("name", ""))
+                edited_profile["email"] = st.text_input("Email:", value=profile_data.get("email", ""))
+                edited_profile["phone"] = st.text_input("Phone:", value=profile_data.get("phone", ""))
+                edited_profile["linkedin"] = st.text_input("LinkedIn:", value=profile_data.get("linkedin", ""))
+
+            with col2:
+                edited_profile["location"] = st.text_input("Location:", value=profile_data.get("location", ""))
+                edited_profile["headline"] = st.text_input("Headline:", value=profile_data.get("headline", ""))
+                edited_profile["portfolio"] = st.text_input("Portfolio:", value=profile_data.get("portfolio", ""))
+
+            edited_profile["objective"] = st.text_area("Objective:", value=profile_data.get("objective", ""), height=100)
+            edited_profile["experience"] = st.text_area("Experience:", value=profile_data.get("experience", ""), height=150)
+            edited_profile["skills"] = st.text_area("Skills:", value=profile_data.get("skills", ""), height=100)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                edited_profile["education"] = st.text_area("Education:", value=profile_data.get("education", ""), height=100)
+            with col2:
+                edited_profile["certifications"] = st.text_area("Certifications:", value=profile_data.get("certifications", ""), height=100)
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if st.button("Update Profile"):
+                    storage.save_profile(profile_to_view, edited_profile)
+                    st.success(f"Profile '{profile_to_view}' updated!")
+            with col2:
+                new_name = st.text_input("New Profile Name:")
+                if st.button("Save As New") and new_name:
+                    storage.save_profile(new_name, edited_profile)
+                    st.success(f"Profile saved as '{new_name}'!")
+            with col3:
+                if st.button("Delete Profile"):
+                    storage.delete_profile(profile_to_view)
+                    st.success(f"Profile '{profile_to_view}' deleted!")
+                    st.rerun()